@@ -0,0 +1,8 @@
+-- Let the server maintain news_sites.updated_at, matching the audit_timestamps
+-- field set (DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP).
+--
+-- Requires MySQL 5.6.5+ / MariaDB 10.0+: older servers allow only one TIMESTAMP
+-- column per table with CURRENT_TIMESTAMP, which created_at already uses. The
+-- INSERTs in scripts/_sites.py set updated_at = NOW() explicitly, so they work
+-- with or without this migration.
+ALTER TABLE indomonitor.news_sites MODIFY updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
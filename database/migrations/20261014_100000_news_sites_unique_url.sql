@@ -0,0 +1,17 @@
+-- Enforce one row per URL in news_sites, so `add site` can insert and detect
+-- duplicates in a single INSERT ... ON DUPLICATE KEY UPDATE statement.
+--
+-- url is TEXT, so the unique key is on a stored SHA-256 hash of the full URL
+-- (like news_scrapes.url_hash) rather than on a prefix of it. A prefix key
+-- would reject different long URLs that share their first characters.
+--
+-- Requires MySQL 5.7.6+ / MariaDB 10.2+ for STORED generated columns.
+--
+-- If an earlier version of this migration added the uq_url prefix key, drop
+-- it first:
+--   ALTER TABLE indomonitor.news_sites DROP INDEX uq_url
+--
+-- Fails if duplicates already exist; find them first with:
+--   SELECT url, COUNT(*) FROM indomonitor.news_sites
+--   GROUP BY SHA2(url, 256) HAVING COUNT(*) > 1
+ALTER TABLE indomonitor.news_sites ADD COLUMN url_hash CHAR(64) AS (SHA2(url, 256)) STORED AFTER url, ADD UNIQUE KEY unique_url_hash (url_hash)
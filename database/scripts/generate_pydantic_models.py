@@ -22,6 +22,11 @@ from pathlib import Path
 from datetime import datetime
 from typing import Any
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 # Type mapping from YAML to Python
 PYTHON_TYPE_MAP = {
     "string": "str",
@@ -116,8 +121,8 @@ def load_field_sets(field_sets_dir: Path) -> dict[str, dict]:
 
     for yaml_file in field_sets_dir.glob("*.yaml"):
         try:
-            with open(yaml_file, 'r') as f:
-                data = yaml.safe_load(f)
+            with open(yaml_file, 'rb') as f:
+                data = yaml.load(f, Loader=YamlLoader)
 
             # Extract field_set (singular key in your schema)
             field_set = data.get("field_set")
@@ -147,8 +152,8 @@ def load_table_schemas(tables_file: Path) -> dict[str, dict]:
     if not tables_file.exists():
         raise FileNotFoundError(f"Table schemas file not found: {tables_file}")
 
-    with open(tables_file, 'r') as f:
-        data = yaml.safe_load(f)
+    with open(tables_file, 'rb') as f:
+        data = yaml.load(f, Loader=YamlLoader)
 
     schemas = data.get("database_schemas", {})
     print(f"  Loaded {len(schemas)} table schemas")
@@ -398,8 +403,7 @@ def main():
 
     # Write output
     print(f"\nWriting models to: {output_file}")
-    with open(output_file, 'w') as f:
-        f.write(full_code)
+    output_file.write_text(full_code, encoding='utf-8')
 
     # Format with Black
     format_with_black(output_file)
@@ -432,8 +436,7 @@ __all__ = [
 ]
 '''
 
-    with open(init_file, 'w') as f:
-        f.write(init_content)
+    init_file.write_text(init_content, encoding='utf-8')
 
     format_with_black(init_file)
 
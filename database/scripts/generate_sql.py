@@ -19,6 +19,11 @@ from pathlib import Path
 from typing import Any
 from collections import defaultdict
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 # Template for generated file header
 FILE_HEADER = '''-- =============================================================================
 -- AUTO-GENERATED CODE - DO NOT EDIT
@@ -69,8 +74,8 @@ def load_field_sets(field_sets_dir: Path) -> dict[str, dict]:
 
     for yaml_file in field_sets_dir.glob("*.yaml"):
         try:
-            with open(yaml_file, 'r') as f:
-                data = yaml.safe_load(f)
+            with open(yaml_file, 'rb') as f:
+                data = yaml.load(f, Loader=YamlLoader)
 
             # Extract field_set (singular key)
             field_set = data.get("field_set")
@@ -100,8 +105,8 @@ def load_table_schemas(tables_file: Path) -> dict[str, dict]:
     if not tables_file.exists():
         raise FileNotFoundError(f"Table schemas file not found: {tables_file}")
 
-    with open(tables_file, 'r') as f:
-        data = yaml.safe_load(f)
+    with open(tables_file, 'rb') as f:
+        data = yaml.load(f, Loader=YamlLoader)
 
     schemas = data.get("database_schemas", {})
     print(f"  Loaded {len(schemas)} table schemas")
@@ -507,8 +512,7 @@ def main():
 
     # Write output
     print(f"\nWriting SQL schema to: {output_file}")
-    with open(output_file, 'w') as f:
-        f.write(full_sql)
+    output_file.write_text(full_sql, encoding='utf-8')
 
     print(f"\n✓ Successfully generated SQL schema")
     print(f"✓ Tables: {len(table_order)}")
@@ -0,0 +1,226 @@
+"""
+Unix-domain socket helpers for running IndoMonitor scripts as resident daemons.
+
+A daemon keeps the Python process (imports, loaded config, open database
+connections) alive and executes commands sent by a thin client, so repeated
+CLI calls skip interpreter startup and the MySQL handshake.
+
+Protocol (one request per connection):
+  client -> daemon: one line of JSON, e.g. {"argv": ["list", "news_sites"]},
+                    optionally with the client's "cwd" and "stdin" contents
+  daemon -> client: one line of JSON: {"stdout": "...", "stderr": "...", "exit_code": 0}
+
+This module only uses the standard library so launchers can import it
+without resolving the scripts' third-party dependencies.
+"""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Exit code reported for a command cut short by SIGTERM (128 + signal number)
+TERMINATED_EXIT_CODE = 128 + signal.SIGTERM
+
+
+class DaemonTerminated(BaseException):
+    """
+    Raised by the SIGTERM handler of serve_forever().
+
+    Derives from BaseException (like SystemExit and KeyboardInterrupt) so
+    command handlers catching Exception do not swallow it, and run_captured()
+    tells it apart from a command calling sys.exit().
+    """
+
+
+def default_socket_path(name: str) -> Path:
+    """
+    Get the socket path for a daemon.
+
+    Uses $INDOMONITOR_SOCKET_DIR, then $XDG_RUNTIME_DIR, then a per-user
+    file in the system temp directory.
+    """
+    runtime_dir = os.getenv('INDOMONITOR_SOCKET_DIR') or os.getenv('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir) / f"{name}.sock"
+    return Path(tempfile.gettempdir()) / f"{name}-{os.getuid()}.sock"
+
+
+def run_captured(func: Callable, *args, stdin: str = '', cwd: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run a CLI handler while capturing its stdout, stderr and exit code.
+
+    Handlers signal failure via sys.exit(), so SystemExit is translated into
+    an exit code instead of stopping the daemon. A command interrupted by
+    DaemonTerminated is reported with TERMINATED_EXIT_CODE.
+
+    Args:
+        func: Handler to call with *args
+        stdin: Text the handler reads from sys.stdin, sent by the client;
+            the daemon's own stdin is never read
+        cwd: Client's working directory, so relative paths resolve as they
+            would in a local run
+
+    Returns:
+        Response dict with stdout, stderr and exit_code
+    """
+    # TextIOWrapper (unlike StringIO) exposes .buffer for handlers that write bytes
+    out_bytes, err_bytes = io.BytesIO(), io.BytesIO()
+    out = io.TextIOWrapper(out_bytes, encoding='utf-8', write_through=True)
+    err = io.TextIOWrapper(err_bytes, encoding='utf-8', write_through=True)
+    exit_code = 0
+    saved_stdin, saved_cwd = sys.stdin, os.getcwd()
+
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            sys.stdin = io.StringIO(stdin)
+            if cwd:
+                os.chdir(cwd)
+            func(*args)
+        except DaemonTerminated:
+            print("Error: daemon terminated while running the command", file=sys.stderr)
+            exit_code = TERMINATED_EXIT_CODE
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                exit_code = e.code or 0
+            else:
+                # sys.exit("message") prints the message and exits with 1
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            exit_code = 1
+        finally:
+            sys.stdin = saved_stdin
+            os.chdir(saved_cwd)
+            out.flush()
+            err.flush()
+
+    return {
+        'stdout': out_bytes.getvalue().decode('utf-8', errors='replace'),
+        'stderr': err_bytes.getvalue().decode('utf-8', errors='replace'),
+        'exit_code': exit_code
+    }
+
+
+def serve_forever(socket_path: Path, handler: Callable[[Dict[str, Any]], Dict[str, Any]]) -> None:
+    """
+    Accept requests on a Unix socket and answer them with handler().
+
+    Requests are handled one at a time, which keeps stdout redirection in
+    run_captured() safe without any locking.
+
+    Args:
+        socket_path: Filesystem path to bind
+        handler: Callable turning a decoded request into a response dict
+    """
+    socket_path = Path(socket_path)
+
+    # Remove a stale socket left behind by a crashed daemon, but refuse to
+    # start twice
+    if socket_path.exists():
+        if is_daemon_running(socket_path):
+            raise RuntimeError(f"Daemon already running on {socket_path}")
+        socket_path.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077)  # Socket is only accessible by the current user
+    try:
+        server.bind(str(socket_path))
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+
+    # Turn `kill` into DaemonTerminated so a running command is reported as
+    # interrupted, then stop so the socket file gets removed
+    terminated = False
+
+    def on_sigterm(signum, frame):
+        nonlocal terminated
+        terminated = True
+        raise DaemonTerminated()
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+
+    try:
+        while not terminated:
+            conn, _ = server.accept()
+            with conn, conn.makefile('rwb') as stream:
+                line = stream.readline()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                    response = handler(request)
+                except DaemonTerminated:
+                    response = {'stdout': '', 'stderr': "Error: daemon terminated while running the command\n",
+                                'exit_code': TERMINATED_EXIT_CODE}
+                except Exception as e:
+                    response = {'stdout': '', 'stderr': f"Error: {e}\n", 'exit_code': 1}
+                try:
+                    stream.write(json.dumps(response).encode('utf-8') + b'\n')
+                    stream.flush()
+                except OSError:
+                    pass  # Client went away
+    except DaemonTerminated:
+        pass  # SIGTERM while waiting for a request
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+
+
+def connect_daemon(socket_path: Path, timeout: Optional[float] = None) -> socket.socket:
+    """
+    Open a connection to a daemon, to pass to send_request().
+
+    Nothing has been sent when this fails, so callers can safely fall back
+    to running the command themselves.
+
+    Raises:
+        OSError: If no daemon is listening on socket_path
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+    except OSError:
+        client.close()
+        raise
+    return client
+
+
+def send_request(client: socket.socket, request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Send one request over a connection from connect_daemon() and wait for its response.
+
+    The connection is closed afterwards.
+
+    Raises:
+        OSError: If the connection fails; the daemon may already have run
+            the request, so it must not simply be retried
+    """
+    with client, client.makefile('rwb') as stream:
+        stream.write(json.dumps(request).encode('utf-8') + b'\n')
+        stream.flush()
+        line = stream.readline()
+
+    if not line:
+        raise ConnectionError("Daemon closed the connection without a response")
+    return json.loads(line)
+
+
+def is_daemon_running(socket_path: Path) -> bool:
+    """Check whether a daemon accepts connections on socket_path."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
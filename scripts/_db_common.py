@@ -0,0 +1,435 @@
+"""
+Shared MySQL helpers for the IndoMonitor database scripts.
+
+Config loading (config/database.yaml + .env), connections, query execution
+and table listing used by manage_db.py, status_check.py and the CLI's
+connection pool. The overview built on top of these lives in _db_overview.
+"""
+
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pymysql
+import yaml
+from dotenv import load_dotenv
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+from _db_output import output_json, output_yaml
+
+# Connection settings that must be set for a server to be usable
+_REQUIRED_CONFIG_FIELDS = ('host', 'port', 'user', 'password')
+
+# Databases reported only with a table count in the overview
+_SYSTEM_DBS = frozenset({'information_schema', 'mysql', 'performance_schema', 'sys'})
+
+_ROOT = Path(__file__).resolve().parent.parent
+_ENV_PATH = _ROOT / '.env'
+_CONFIG_PATH = _ROOT / 'config' / 'database.yaml'
+
+
+@lru_cache(maxsize=1)
+def load_environment() -> None:
+    """
+    Load environment variables from .env file.
+
+    Cached: the .env file is only read on the first call per process.
+    """
+    if not _ENV_PATH.exists():
+        return
+    load_dotenv(_ENV_PATH)
+
+
+@lru_cache(maxsize=1)
+def load_database_config() -> Dict:
+    """
+    Load database configuration from config/database.yaml.
+
+    Cached: the file is parsed once per process and every caller receives
+    the same dict, which must therefore not be mutated.
+    """
+    if not _CONFIG_PATH.exists():
+        error_exit(f"Configuration file not found at {_CONFIG_PATH}", json_output=False)
+    
+    # Bytes go straight to libyaml, which decodes UTF-8 itself
+    return yaml.load(_CONFIG_PATH.read_bytes(), Loader=YamlLoader)
+
+
+def get_all_connection_names(db_config: Optional[Dict] = None) -> List[str]:
+    """Get list of all configured MySQL connection names."""
+    if db_config is None:
+        db_config = load_database_config()
+    connections = db_config.get('mysql_connections', {})
+    return list(connections.keys())
+
+
+def is_config_complete(config: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    """
+    Check if all required configuration values are non-empty.
+    
+    Returns:
+        Tuple of (is_complete, missing_vars)
+    """
+    # None, '', whitespace-only strings and port 0 (unset) all count as missing
+    missing = [
+        field for field in _REQUIRED_CONFIG_FIELDS
+        if not (value := config.get(field)) or (isinstance(value, str) and not value.strip())
+    ]
+
+    return not missing, missing
+
+
+def get_connection_config(connection_name: str, db_config: Optional[Dict] = None) -> Dict[str, Any]:
+    """
+    Get MySQL connection configuration for specified connection.
+
+    Args:
+        connection_name: Name of the connection in config/database.yaml
+        db_config: Already loaded database config (default: load_database_config())
+    """
+    if db_config is None:
+        db_config = load_database_config()
+    
+    # Get connection settings
+    connections = db_config.get('mysql_connections', {})
+    if connection_name not in connections:
+        available = ', '.join(connections.keys())
+        error_exit(
+            f"Connection '{connection_name}' not found. Available: {available}",
+            json_output=False
+        )
+    
+    conn_settings = connections[connection_name]
+    env_prefix = conn_settings['env_prefix']
+    
+    # Build config from environment variables (a missing or blank port is 0,
+    # which is_config_complete() reports as missing)
+    env = os.environ
+    port_raw = env.get(f'{env_prefix}_PORT', '').strip()
+    config = {
+        'name': connection_name,
+        'host': env.get(f'{env_prefix}_HOST', ''),
+        'port': int(port_raw) if port_raw else 0,
+        'user': env.get(f'{env_prefix}_USER', ''),
+        'password': env.get(f'{env_prefix}_PASSWORD', ''),
+        'connection_timeout': conn_settings.get('connection_timeout', 5),
+        'read_timeout': conn_settings.get('read_timeout', 30),
+        'write_timeout': conn_settings.get('write_timeout', 30),
+        'charset': conn_settings.get('charset', 'utf8mb4'),
+    }
+    
+    return config
+
+
+def get_connection(config: Dict[str, Any], raise_on_error: bool = True, database: Optional[str] = None) -> Optional[pymysql.connections.Connection]:
+    """
+    Create and return a MySQL connection.
+
+    Args:
+        config: Connection configuration
+        raise_on_error: If False, return None on connection failure instead of raising
+        database: Optional database name to auto-select upon connection
+
+    Returns:
+        Connection object or None if connection failed and raise_on_error=False
+    """
+    try:
+        connect_args = {
+            'host': config['host'],
+            'port': config['port'],
+            'user': config['user'],
+            'password': config['password'],
+            'connect_timeout': config['connection_timeout'],
+            'read_timeout': config['read_timeout'],
+            'write_timeout': config['write_timeout'],
+            'charset': config['charset'],
+            # Writes are committed by the server as part of the statement, so
+            # no query inspection or separate COMMIT round-trip is needed
+            'autocommit': True
+        }
+
+        # Add database parameter if provided
+        if database:
+            connect_args['database'] = database
+
+        connection = pymysql.connect(**connect_args)
+        return connection
+    except pymysql.Error as e:
+        if raise_on_error:
+            error_exit(f"Connection failed: {e}")
+        return None
+
+
+def sanitize_sql(sql: str) -> str:
+    """
+    Sanitize SQL query to fix common shell escaping issues.
+
+    Specifically handles:
+    - Escaped != operator (\\!= -> !=) caused by shell history expansion
+
+    Args:
+        sql: Raw SQL query string
+
+    Returns:
+        Sanitized SQL query string
+    """
+    # Fix escaped != operator from shell. No `in` pre-check needed: when
+    # nothing matches, str.replace() returns sql itself without copying it
+    return sql.replace('\\!=', '!=')
+
+
+def execute_sql(connection: pymysql.connections.Connection, sql: str,
+                cursor: Optional[pymysql.cursors.Cursor] = None) -> Tuple[List[Tuple], List[str]]:
+    """
+    Execute SQL query and return results with column names.
+
+    Args:
+        connection: Open database connection
+        sql: SQL query to execute
+        cursor: Optional cursor to reuse; by default a cursor is opened and
+            closed for this query
+
+    Returns:
+        Tuple of (rows, column_names)
+    """
+    # Sanitize SQL to fix shell escaping issues
+    sql = sanitize_sql(sql)
+
+    if cursor is None:
+        with connection.cursor() as cursor:
+            return _execute_on_cursor(cursor, sql)
+    return _execute_on_cursor(cursor, sql)
+
+
+def _execute_on_cursor(cursor: pymysql.cursors.Cursor, sql: str) -> Tuple[List[Tuple], List[str]]:
+    """Run an already sanitized query on the given cursor (see execute_sql())."""
+    cursor.execute(sql)
+
+    # Get column names if available
+    column_names = []
+    if cursor.description:
+        column_names = [desc[0] for desc in cursor.description]
+
+    # Fetch all results
+    rows = cursor.fetchall()
+
+    return rows, column_names
+
+
+def execute_sql_stream(connection: pymysql.connections.Connection, sql: str,
+                       batch_size: int = 1000) -> Tuple[Iterator[Tuple], List[str]]:
+    """
+    Execute SQL query on a server-side cursor and return a lazy row iterator.
+
+    Unlike execute_sql() the result set is not buffered on the client: rows
+    are fetched in batches of batch_size while the iterator is consumed, so
+    memory use stays flat for arbitrarily large results. The connection
+    cannot run other queries until the iterator is exhausted.
+
+    Returns:
+        Tuple of (row_iterator, column_names)
+    """
+    # Sanitize SQL to fix shell escaping issues
+    sql = sanitize_sql(sql)
+
+    cursor = connection.cursor(pymysql.cursors.SSCursor)
+    cursor.execute(sql)
+
+    # Get column names if available
+    column_names = []
+    if cursor.description:
+        column_names = [desc[0] for desc in cursor.description]
+
+    def iter_rows() -> Iterator[Tuple]:
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    return iter_rows(), column_names
+
+
+def get_databases(connection: pymysql.connections.Connection,
+                  cursor: Optional[pymysql.cursors.Cursor] = None) -> List[str]:
+    """Get list of all databases."""
+    return _first_column(connection, "SHOW DATABASES", cursor)
+
+
+def _first_column(connection: pymysql.connections.Connection, sql: str,
+                  cursor: Optional[pymysql.cursors.Cursor] = None) -> List[Any]:
+    """
+    Run an internal metadata query and return the first value of each row.
+
+    Unlike execute_sql() this skips SQL sanitizing and column-name
+    collection, and iterates the cursor instead of copying its rows with
+    fetchall().
+    """
+    if cursor is None:
+        with connection.cursor() as cursor:
+            return _first_column(connection, sql, cursor)
+
+    cursor.execute(sql)
+    return [row[0] for row in cursor]
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Quote a database or table name for use in SQL.
+
+    Identifiers cannot be passed as query parameters, so names from
+    SHOW DATABASES / SHOW TABLES are backtick-quoted with embedded
+    backticks doubled, which is safe for any name MySQL allows.
+    """
+    return '`' + name.replace('`', '``') + '`'
+
+
+def get_tables(connection: pymysql.connections.Connection, database: str,
+               cursor: Optional[pymysql.cursors.Cursor] = None) -> List[str]:
+    """Get list of tables in a specific database."""
+    return _first_column(connection, f"SHOW TABLES FROM {quote_identifier(database)}", cursor)
+
+
+def get_all_tables(connection: pymysql.connections.Connection, databases: List[str],
+                   cursor: Optional[pymysql.cursors.Cursor] = None) -> Dict[str, List[str]]:
+    """
+    Get the tables of several databases in one information_schema query.
+
+    Returns:
+        Dict mapping each database to its table names, ordered by name
+        (an empty list for databases without tables)
+    """
+    tables: Dict[str, List[str]] = {db: [] for db in databases}
+    if not databases:
+        return tables
+
+    placeholders = ','.join(['%s'] * len(databases))
+    sql = (
+        "SELECT table_schema, table_name FROM information_schema.tables "
+        f"WHERE table_schema IN ({placeholders}) ORDER BY table_schema, table_name"
+    )
+    if cursor is None:
+        with connection.cursor() as cursor:
+            return get_all_tables(connection, databases, cursor)
+
+    cursor.execute(sql, databases)
+    for db, name in cursor.fetchall():
+        tables.setdefault(db, []).append(name)
+    return tables
+
+
+def get_all_table_update_times(connection: pymysql.connections.Connection, databases: List[str],
+                               cursor: Optional[pymysql.cursors.Cursor] = None
+                               ) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+    """
+    Get the tables of several databases with their last modification time.
+
+    A time is only reported once it is at least a second in the past, so
+    any later write is guaranteed to change it; otherwise, and when the
+    server does not track it (InnoDB on MariaDB, or MySQL since its last
+    restart), it is None.
+
+    Returns:
+        Dict mapping each database to its (table_name, update_time) tuples,
+        ordered by name, with update_time as a string
+    """
+    times: Dict[str, List[Tuple[str, Optional[str]]]] = {db: [] for db in databases}
+    if not databases:
+        return times
+
+    placeholders = ','.join(['%s'] * len(databases))
+    sql = (
+        "SELECT table_schema, table_name, "
+        "IF(update_time < NOW() - INTERVAL 1 SECOND, update_time, NULL) "
+        f"FROM information_schema.tables WHERE table_schema IN ({placeholders}) "
+        "ORDER BY table_schema, table_name"
+    )
+    if cursor is None:
+        with connection.cursor() as cursor:
+            return get_all_table_update_times(connection, databases, cursor)
+
+    # MySQL 8 caches information_schema statistics, update_time included,
+    # for up to a day by default; older servers and MariaDB do not have
+    # the variable and always report current values
+    try:
+        cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+    except pymysql.Error:
+        pass
+
+    cursor.execute(sql, databases)
+    for db, name, update_time in cursor.fetchall():
+        times.setdefault(db, []).append((name, None if update_time is None else str(update_time)))
+    return times
+
+
+def get_table_row_count(connection: pymysql.connections.Connection, database: str, table: str,
+                        cursor: Optional[pymysql.cursors.Cursor] = None) -> int:
+    """Get row count for a specific table."""
+    sql = f"SELECT COUNT(*) FROM {quote_identifier(database)}.{quote_identifier(table)}"
+    return _first_column(connection, sql, cursor)[0]
+
+
+def get_table_row_estimates(connection: pymysql.connections.Connection, database: str,
+                            cursor: Optional[pymysql.cursors.Cursor] = None) -> List[Tuple[str, Optional[int], bool]]:
+    """
+    Get row counts for all tables of a database from information_schema.
+
+    See get_all_table_row_estimates() for the meaning of the counts.
+
+    Returns:
+        List of (table_name, row_count, is_estimate) tuples, ordered by name
+    """
+    return get_all_table_row_estimates(connection, [database], cursor)[database]
+
+
+def get_all_table_row_estimates(connection: pymysql.connections.Connection, databases: List[str],
+                                cursor: Optional[pymysql.cursors.Cursor] = None
+                                ) -> Dict[str, List[Tuple[str, Optional[int], bool]]]:
+    """
+    Get row counts for all tables of several databases in one query.
+
+    Reads information_schema instead of running a COUNT(*) per table.
+    InnoDB only keeps an optimizer estimate; other engines (MyISAM, Aria,
+    MEMORY) store the exact count. Views have no count (None).
+
+    Returns:
+        Dict mapping each database to its (table_name, row_count, is_estimate)
+        tuples, ordered by name (an empty list for databases without tables)
+    """
+    estimates: Dict[str, List[Tuple[str, Optional[int], bool]]] = {db: [] for db in databases}
+    if not databases:
+        return estimates
+
+    placeholders = ','.join(['%s'] * len(databases))
+    sql = (
+        "SELECT table_schema, table_name, table_rows, engine FROM information_schema.tables "
+        f"WHERE table_schema IN ({placeholders}) ORDER BY table_schema, table_name"
+    )
+    if cursor is None:
+        with connection.cursor() as cursor:
+            return get_all_table_row_estimates(connection, databases, cursor)
+
+    cursor.execute(sql, databases)
+    for db, name, rows, engine in cursor.fetchall():
+        estimates.setdefault(db, []).append((name, rows, engine == 'InnoDB'))
+    return estimates
+
+
+def error_exit(message: str, json_output: bool = False, yaml_output: bool = False) -> None:
+    """Exit with error message."""
+    if json_output:
+        output_json('error', error=message)
+    elif yaml_output:
+        output_yaml('error', error=message)
+    else:
+        print(f"Error: {message}", file=sys.stderr)
+    sys.exit(1)
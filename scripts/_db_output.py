@@ -0,0 +1,258 @@
+"""
+Output formatting for manage_db.py: human-readable text, JSON and YAML.
+
+The write_sql_results_* functions emit query results row by row, so
+--stream can print arbitrarily large result sets without holding them in
+memory. Their output is identical to the buffered formatters.
+"""
+
+import io
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
+
+import yaml
+
+# libyaml's C emitter when PyYAML was built against it. CDumper (not
+# CSafeDumper) matches the default yaml.Dumper, which also represents
+# Decimal values that SafeDumper rejects.
+try:
+    from yaml import CDumper as YamlDumper
+except ImportError:
+    from yaml import Dumper as YamlDumper
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+
+def _dumps_json(obj: Any) -> str:
+    """
+    Serialize obj as 2-space indented JSON, stringifying unsupported values.
+
+    Uses orjson when available. Datetimes are passed through to str() so
+    they keep the "YYYY-MM-DD HH:MM:SS" form of the stdlib path; the only
+    difference is that non-ASCII text is emitted as UTF-8 instead of
+    \\u escapes.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME, default=str
+        ).decode('utf-8')
+    return json.dumps(obj, indent=2, default=str)
+
+
+def write_overview_text(overview: Dict[str, Any], out: Optional[TextIO] = None) -> None:
+    """Write a database overview as human-readable text, line by line."""
+    out = out or sys.stdout
+    server = overview['server']
+
+    # Handle config missing
+    if overview.get('status') == 'config missing':
+        missing_str = ', '.join(overview.get('missing_vars', []))
+        out.write(f"server: {server}, db: -, status: config incomplete ({missing_str} missing)\n")
+        out.write("\n")  # Empty line
+        return
+
+    # Handle not reachable
+    if overview.get('status') == 'not reachable':
+        out.write(f"server: {server}, db: -, status: not reachable\n")
+        if 'host' in overview and 'port' in overview:
+            out.write(f"  target: {overview['host']}:{overview['port']}\n")
+        return
+
+    # Handle error
+    if overview.get('status') == 'error':
+        out.write(f"server: {server}, db: -, status: error\n")
+        if 'error' in overview:
+            out.write(f"  error: {overview['error']}\n")
+        return
+
+    # Handle connected servers (status: ok)
+    for db_info in overview.get('user_databases', []):
+        out.write(f"server: {server}, db: {db_info['name']}, status: ok\n")
+
+        if not db_info['tables']:
+            out.write("  (no tables)\n")
+        else:
+            for table in db_info['tables']:
+                if table.get('error'):
+                    out.write(f"  {table['name']}: ERROR - {table['error']}\n")
+                elif table.get('estimated'):
+                    out.write(f"  {table['name']}: ~{table['row_count']}\n")
+                else:
+                    out.write(f"  {table['name']}: {table['row_count']}\n")
+        out.write("\n")  # Empty line between databases
+
+    # If no user databases, show minimal info
+    if not overview.get('user_databases'):
+        out.write(f"server: {server}, db: -, status: ok\n")
+        out.write("  (no user databases)\n")
+        out.write("\n")
+
+
+def format_overview_text(overview: Dict[str, Any]) -> str:
+    """Format database overview as human-readable text."""
+    buf = io.StringIO()
+    write_overview_text(overview, buf)
+    return buf.getvalue()[:-1]  # Without the final newline, like "\n".join()
+
+
+def write_all_servers_text(all_overviews: Iterable[Dict[str, Any]], out: Optional[TextIO] = None) -> None:
+    """
+    Write all server overviews as human-readable text, followed by a newline.
+
+    Output is written server by server. Trailing whitespace is held back
+    until more text follows, so the result equals format_all_servers_text()
+    (which strips it at the end) without building the whole string.
+    """
+    out = out or sys.stdout
+    held = ''
+
+    for index, overview in enumerate(all_overviews):
+        if index:
+            held += "\n"
+        block = format_overview_text(overview)
+        stripped = block.rstrip()
+        if stripped:
+            out.write(held + stripped)
+            held = block[len(stripped):]
+        else:
+            held += block
+
+    out.write("\n")
+
+
+def format_all_servers_text(all_overviews: List[Dict[str, Any]]) -> str:
+    """Format all server overviews as human-readable text."""
+    buf = io.StringIO()
+    write_all_servers_text(all_overviews, buf)
+    return buf.getvalue()[:-1]
+
+
+def format_sql_results_text(rows: List[Tuple], column_names: List[str]) -> str:
+    """Format SQL query results as human-readable text."""
+    if not rows:
+        return "(no results)"
+    
+    lines = []
+    
+    # Add column headers if available
+    if column_names:
+        lines.append(" | ".join(column_names))
+        lines.append("-" * 80)
+    
+    # Add rows
+    for row in rows:
+        lines.append(" | ".join(map(str, row)))
+    
+    return "\n".join(lines)
+
+
+def output_json(status: str, data: Any = None, error: str = None) -> None:
+    """Output JSON response."""
+    response = {
+        'status': status,
+        'data': data,
+        'error': error
+    }
+    print(_dumps_json(response))
+
+
+def output_yaml(status: str, data: Any = None, error: str = None) -> None:
+    """Output YAML response."""
+    response = {
+        'status': status,
+        'data': data,
+        'error': error
+    }
+    print(yaml.dump(response, Dumper=YamlDumper,
+                    default_flow_style=False, sort_keys=False, allow_unicode=True))
+
+
+def _row_to_data(row: Tuple, column_names: List[str]) -> Any:
+    """Convert a row to its JSON/YAML form: a dict if column names are known, else a list."""
+    return dict(zip(column_names, row)) if column_names else list(row)
+
+
+def write_sql_results_text(rows: Iterable[Tuple], column_names: List[str],
+                           out: Optional[TextIO] = None) -> int:
+    """
+    Write SQL query results as text, row by row (same layout as format_sql_results_text()).
+
+    Returns:
+        Number of rows written
+    """
+    # Resolved per call so redirected stdout (daemon mode) is honoured
+    out = out or sys.stdout
+    count = 0
+    for row in rows:
+        if count == 0 and column_names:
+            out.write(" | ".join(column_names) + "\n")
+            out.write("-" * 80 + "\n")
+        out.write(" | ".join(map(str, row)) + "\n")
+        count += 1
+
+    if count == 0:
+        out.write("(no results)\n")
+    return count
+
+
+def write_sql_results_json(server: str, rows: Iterable[Tuple], column_names: List[str],
+                           out: Optional[TextIO] = None) -> int:
+    """
+    Write SQL query results as a JSON response, row by row.
+
+    Produces the same document as output_json('success', data={'server': ...,
+    'rows': [...], 'row_count': N}) without building the rows list.
+
+    Returns:
+        Number of rows written
+    """
+    out = out or sys.stdout
+    out.write('{\n  "status": "success",\n  "data": {\n    "server": ' + json.dumps(server) + ',\n    "rows": [')
+
+    count = 0
+    for row in rows:
+        # Re-indent the row to its nesting level inside the response
+        item = _dumps_json(_row_to_data(row, column_names)).replace('\n', '\n      ')
+        out.write((',\n      ' if count else '\n      ') + item)
+        count += 1
+
+    out.write('\n    ]' if count else ']')
+    out.write(f',\n    "row_count": {count}\n  }},\n  "error": null\n}}\n')
+    return count
+
+
+def write_sql_results_yaml(server: str, rows: Iterable[Tuple], column_names: List[str],
+                           out: Optional[TextIO] = None) -> int:
+    """
+    Write SQL query results as a YAML response, row by row.
+
+    Produces the same document as output_yaml('success', data={'server': ...,
+    'rows': [...], 'row_count': N}) without building the rows list.
+
+    Returns:
+        Number of rows written
+    """
+    out = out or sys.stdout
+    out.write(yaml.dump({'status': 'success', 'data': {'server': server}},
+                        Dumper=YamlDumper, default_flow_style=False, sort_keys=False,
+                        allow_unicode=True))
+
+    count = 0
+    for row in rows:
+        if count == 0:
+            out.write("  rows:\n")
+        item = yaml.dump([_row_to_data(row, column_names)],
+                         Dumper=YamlDumper, default_flow_style=False, sort_keys=False,
+                         allow_unicode=True)
+        out.write("".join("  " + line for line in item.splitlines(keepends=True)))
+        count += 1
+
+    if count == 0:
+        out.write("  rows: []\n")
+    # Trailing blank line matches print() of a yaml.dump() result
+    out.write(f"  row_count: {count}\nerror: null\n\n")
+    return count
@@ -0,0 +1,277 @@
+"""
+Server overview for manage_db.py and status_check.py: databases, tables and
+row counts per server, with all configured servers queried in parallel.
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import pymysql
+
+from _db_common import (
+    _SYSTEM_DBS,
+    get_all_connection_names,
+    get_all_table_row_estimates,
+    get_all_table_update_times,
+    get_all_tables,
+    get_connection,
+    get_connection_config,
+    get_databases,
+    get_table_row_count,
+    is_config_complete,
+    load_database_config
+)
+
+# Parallel connections per server for COUNT(*) queries
+COUNT_WORKERS = 8
+
+
+def get_database_overview(connection: pymysql.connections.Connection, server_name: str,
+                          exact_counts: bool = False,
+                          config: Optional[Dict[str, Any]] = None,
+                          count_workers: int = COUNT_WORKERS,
+                          snapshot: Optional[Dict[str, Dict[str, list]]] = None) -> Dict[str, Any]:
+    """
+    Get overview of all databases and their tables.
+
+    Row counts come from information_schema (estimates for InnoDB tables,
+    flagged with 'estimated': True) unless exact_counts is set, which runs
+    a COUNT(*) per table. Tables without a stored count, such as views,
+    are always counted exactly.
+
+    Args:
+        connection: Open connection to the server
+        server_name: Name reported in the overview
+        exact_counts: COUNT(*) every table instead of reading information_schema
+        config: Connection config of the server; when given, COUNT(*)
+            queries run on up to count_workers parallel connections
+        count_workers: Maximum parallel connections for COUNT(*) queries
+        snapshot: With exact_counts, exact counts of a previous run as
+            {database: {table: [update_time, row_count]}}. Counts of tables
+            not modified since are reused instead of running COUNT(*), and
+            the dict is updated in place with this run's counts.
+
+    Returns structured data suitable for JSON or text output.
+    """
+    # One cursor for all queries of the overview instead of one per query
+    with connection.cursor() as cursor:
+        return _build_overview(connection, cursor, server_name, exact_counts, config, count_workers,
+                               snapshot)
+
+
+def _build_overview(connection: pymysql.connections.Connection, cursor: pymysql.cursors.Cursor,
+                    server_name: str, exact_counts: bool,
+                    config: Optional[Dict[str, Any]] = None,
+                    count_workers: int = COUNT_WORKERS,
+                    snapshot: Optional[Dict[str, Dict[str, list]]] = None) -> Dict[str, Any]:
+    """Collect the get_database_overview() data using the given cursor."""
+    databases = get_databases(connection, cursor)
+    user_databases = [db for db in databases if db not in _SYSTEM_DBS]
+    system_databases = sorted(_SYSTEM_DBS.intersection(databases))
+    
+    overview = {
+        'server': server_name,
+        'status': 'ok',
+        'total_databases': len(databases),
+        'user_databases': [],
+        'system_databases': []
+    }
+
+    # Tables that need a COUNT(*): (database, table, table_info to fill in)
+    pending = []
+    
+    # Tables of all databases (with their stored counts unless exact_counts,
+    # or their modification times to check the snapshot against) in a
+    # single information_schema query
+    update_times: Dict[str, Dict[str, Optional[str]]] = {}
+    if exact_counts and snapshot is not None:
+        update_times = {
+            db: dict(entries)
+            for db, entries in get_all_table_update_times(
+                connection, user_databases + system_databases, cursor).items()
+        }
+        tables_by_db = {db: list(times) for db, times in update_times.items()}
+    elif exact_counts:
+        tables_by_db = get_all_tables(connection, user_databases + system_databases, cursor)
+    else:
+        estimates = get_all_table_row_estimates(connection, user_databases + system_databases, cursor)
+    
+    # Process user databases
+    for db in user_databases:
+        db_info = {
+            'name': db,
+            'tables': []
+        }
+
+        if exact_counts:
+            tables = [(table, _snapshot_count(snapshot, update_times, db, table), False)
+                      for table in tables_by_db[db]]
+        else:
+            tables = estimates[db]
+
+        for table, count, estimated in tables:
+            table_info = {'name': table, 'row_count': count}
+            if count is None:
+                pending.append((db, table, table_info))
+            elif estimated:
+                table_info['estimated'] = True
+            db_info['tables'].append(table_info)
+        
+        overview['user_databases'].append(db_info)
+
+    # The queries are network-bound, so they overlap well on parallel
+    # connections; whatever those could not count is counted here
+    work: queue.SimpleQueue = queue.SimpleQueue()
+    for item in pending:
+        work.put(item)
+    if config is not None and len(pending) > 1:
+        _count_rows_parallel(config, work, min(count_workers, len(pending)))
+    _count_rows(connection, work, cursor)
+
+    if exact_counts and snapshot is not None:
+        _refresh_snapshot(snapshot, update_times, overview['user_databases'])
+    
+    # Process system databases (just count tables)
+    for db in system_databases:
+        tables = tables_by_db[db] if exact_counts else estimates[db]
+        overview['system_databases'].append({
+            'name': db,
+            'table_count': len(tables)
+        })
+    
+    return overview
+
+
+def _snapshot_count(snapshot: Optional[Dict[str, Dict[str, list]]],
+                    update_times: Dict[str, Dict[str, Optional[str]]],
+                    db: str, table: str) -> Optional[int]:
+    """Get a table's count from the snapshot if it is unchanged since, else None."""
+    if snapshot is None:
+        return None
+    update_time = update_times[db][table]
+    cached = snapshot.get(db, {}).get(table)
+    if update_time is None or cached is None or cached[0] != update_time:
+        return None
+    return cached[1]
+
+
+def _refresh_snapshot(snapshot: Dict[str, Dict[str, list]],
+                      update_times: Dict[str, Dict[str, Optional[str]]],
+                      user_databases: List[Dict[str, Any]]) -> None:
+    """Replace the snapshot with this run's counts of tables with a known modification time."""
+    snapshot.clear()
+    for db_info in user_databases:
+        db = db_info['name']
+        for table_info in db_info['tables']:
+            update_time = update_times[db][table_info['name']]
+            if update_time is not None and 'error' not in table_info:
+                snapshot.setdefault(db, {})[table_info['name']] = [update_time, table_info['row_count']]
+
+
+def _count_rows(connection: pymysql.connections.Connection, work: queue.SimpleQueue,
+                cursor: Optional[pymysql.cursors.Cursor] = None) -> None:
+    """Run COUNT(*) for the queued (database, table, table_info) entries until the queue is empty."""
+    while True:
+        try:
+            db, table, table_info = work.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            table_info['row_count'] = get_table_row_count(connection, db, table, cursor)
+        except pymysql.Error as e:
+            table_info['error'] = str(e)
+
+
+def _count_rows_parallel(config: Dict[str, Any], work: queue.SimpleQueue, workers: int) -> None:
+    """
+    Drain the COUNT(*) queue with one extra connection per worker thread.
+
+    A worker that cannot connect simply exits; entries it did not take stay
+    queued for the caller.
+    """
+    def worker() -> None:
+        connection = get_connection(config, raise_on_error=False)
+        if connection is None:
+            return
+        try:
+            with connection.cursor() as cursor:
+                _count_rows(connection, work, cursor)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in range(workers):
+            executor.submit(worker)
+
+
+def _overview_for(conn_name: str, db_config: Optional[Dict] = None,
+                  exact_counts: bool = False) -> Dict[str, Any]:
+    """
+    Get the overview of one configured server.
+
+    Never raises: missing config, unreachable servers and unexpected errors
+    are reported as status entries, so one bad server does not affect the
+    others.
+    """
+    try:
+        config = get_connection_config(conn_name, db_config)
+
+        # Check if config is complete
+        is_complete, missing_vars = is_config_complete(config)
+
+        if not is_complete:
+            # Config is missing required values
+            return {
+                'server': conn_name,
+                'status': 'config missing',
+                'missing_vars': missing_vars
+            }
+
+        # Try to connect
+        connection = get_connection(config, raise_on_error=False)
+
+        if connection is None:
+            # Server not reachable
+            return {
+                'server': conn_name,
+                'status': 'not reachable',
+                'host': config['host'],
+                'port': config['port']
+            }
+
+        # Server reachable - get full overview
+        try:
+            return get_database_overview(connection, conn_name, exact_counts, config)
+        finally:
+            connection.close()
+
+    except Exception as e:
+        return {
+            'server': conn_name,
+            'status': 'error',
+            'error': str(e)
+        }
+
+
+def get_all_servers_overview(exact_counts: bool = False) -> List[Dict[str, Any]]:
+    """
+    Get overview of ALL configured servers.
+
+    Servers are queried in parallel threads (the work is network-bound), so
+    the total time is that of the slowest server rather than the sum.
+
+    Returns list of server overviews in configuration order, including
+    unreachable servers and those with missing config.
+    """
+    # Loaded once and shared by all worker threads
+    db_config = load_database_config()
+    connection_names = get_all_connection_names(db_config)
+    if not connection_names:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(32, len(connection_names))) as executor:
+        return list(executor.map(
+            lambda name: _overview_for(name, db_config, exact_counts),
+            connection_names
+        ))
@@ -0,0 +1,122 @@
+"""
+The 'get' command of the IndoMonitor CLI: render URLs via Splash and print
+them as HTML or Markdown.
+
+Like indomonitor.py, this module only imports the standard library at load
+time; httpx and the Splash/Markdown helpers are imported when a fetch runs.
+"""
+
+import sys
+
+from _sites import validate_url
+
+
+def stream_single_url(url: str, output_format: str, args) -> None:
+    """
+    Fetch one URL for 'get' and write it out while it downloads.
+
+    HTML chunks go straight to stdout and Markdown is converted
+    incrementally, so the page is never materialized as one string.
+    """
+    import httpx
+    from _splash import stream_html_via_splash
+    from _markdown import chunks_to_markdown
+
+    chunks = stream_html_via_splash(url, use_cache=args.cache, refresh=args.refresh)
+    try:
+        if output_format == 'markdown':
+            print(chunks_to_markdown(chunks))
+        else:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            sys.stdout.write('\n')
+    except httpx.HTTPError as e:
+        print(f"Error fetching {url} via Splash: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        if output_format == 'markdown':
+            print(f"Error converting HTML to Markdown: {e}", file=sys.stderr)
+        else:
+            print(f"Unexpected error fetching {url}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def cmd_get(args):
+    """Handle 'get' command and 'get md' subcommand."""
+    # Parse the arguments manually to handle both 'get <url>...' and 'get md <url>...'
+    arguments = args.args
+
+    if len(arguments) < 1:
+        print("Error: URL required", file=sys.stderr)
+        print("Usage: ./scripts/indomonitor.py get <url> [<url> ...]", file=sys.stderr)
+        print("       ./scripts/indomonitor.py get md <url> [<url> ...]", file=sys.stderr)
+        sys.exit(1)
+
+    # Check if first argument is 'md' (subcommand)
+    if arguments[0] == 'md':
+        # This is 'get md <url>...'
+        if len(arguments) < 2:
+            print("Error: URL required for 'get md' command", file=sys.stderr)
+            print("Usage: ./scripts/indomonitor.py get md <url> [<url> ...]", file=sys.stderr)
+            sys.exit(1)
+
+        urls = arguments[1:]
+        output_format = 'markdown'
+    else:
+        # This is 'get <url>...'
+        urls = arguments
+        output_format = 'html'
+
+    # Validate URL formats and use the normalized URLs
+    normalized_urls = []
+    for url in urls:
+        is_valid, domain, normalized_url = validate_url(url)
+        if not is_valid:
+            print(f"Error: Invalid URL format: {url}", file=sys.stderr)
+            print("URL must be a valid domain or http:// / https:// URL", file=sys.stderr)
+            sys.exit(1)
+        normalized_urls.append(normalized_url)
+
+    # A single URL is streamed straight to the output, several URLs are
+    # rendered concurrently
+    if len(normalized_urls) == 1:
+        stream_single_url(normalized_urls[0], output_format, args)
+        return
+
+    import httpx
+    from _splash import fetch_many_via_splash
+    from _markdown import html_to_markdown_many
+
+    results = fetch_many_via_splash(normalized_urls, use_cache=args.cache, refresh=args.refresh)
+
+    # Convert all successfully fetched pages in one batch, so large batches
+    # can be spread over several cores
+    if output_format == 'markdown':
+        fetched = [i for i, result in enumerate(results) if not isinstance(result, BaseException)]
+        markdowns = html_to_markdown_many([results[i] for i in fetched])
+        converted = dict(zip(fetched, markdowns))
+
+    # Output based on format, in the order the URLs were given
+    failed = False
+    for i, (url, result) in enumerate(zip(normalized_urls, results)):
+        if isinstance(result, httpx.HTTPError):
+            print(f"Error fetching {url} via Splash: {result}", file=sys.stderr)
+            failed = True
+            continue
+        if isinstance(result, BaseException):
+            print(f"Unexpected error fetching {url}: {result}", file=sys.stderr)
+            failed = True
+            continue
+
+        if output_format == 'markdown':
+            markdown = converted[i]
+            if isinstance(markdown, BaseException):
+                print(f"Error converting HTML to Markdown: {markdown}", file=sys.stderr)
+                failed = True
+            else:
+                print(markdown)
+        else:
+            print(result)
+
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,104 @@
+"""
+HTML to Markdown conversion for the IndoMonitor CLI.
+
+html2text is pure-Python and CPU-bound, so larger batches are converted in
+a process pool to use more than one core.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Union
+
+import html2text
+
+# Batches up to this size are converted in-process; forking workers costs
+# more than it saves for a handful of pages
+PARALLEL_THRESHOLD = 4
+
+# Converter options, applied to every HTML2Text instance
+HTML2TEXT_OPTIONS = {
+    'ignore_links': False,
+    'ignore_images': False,
+    'ignore_emphasis': False,
+    'body_width': 0,  # Don't wrap lines
+}
+
+
+def _new_converter() -> html2text.HTML2Text:
+    """Create an HTML2Text converter configured with HTML2TEXT_OPTIONS."""
+    converter = html2text.HTML2Text()
+    for option, value in HTML2TEXT_OPTIONS.items():
+        setattr(converter, option, value)
+    return converter
+
+
+def html_to_markdown(html: str) -> str:
+    """
+    Convert HTML to Markdown format.
+
+    A fresh converter is used per document: HTML2Text keeps parser state
+    (open <pre>/<blockquote>/list tags, pending link references) across
+    handle() calls, so a reused instance lets a page with unclosed tags
+    corrupt the next page's output. Construction costs a few microseconds,
+    negligible next to parsing.
+
+    Args:
+        html: HTML string to convert
+
+    Returns:
+        Markdown formatted string
+    """
+    return _new_converter().handle(html)
+
+
+def chunks_to_markdown(chunks: Iterable[str]) -> str:
+    """
+    Convert HTML arriving in chunks to Markdown.
+
+    Feeds html2text's incremental parser chunk by chunk, so the complete
+    HTML document never has to be assembled in memory. Produces the same
+    output as html_to_markdown() on the joined chunks.
+
+    Args:
+        chunks: Iterable of HTML text chunks
+
+    Returns:
+        Markdown formatted string
+    """
+    converter = _new_converter()
+    for chunk in chunks:
+        converter.feed(chunk)
+
+    # Same finishing steps as HTML2Text.handle()
+    converter.feed("")
+    markdown = converter.optwrap(converter.finish())
+    if converter.pad_tables:
+        return html2text.pad_tables_in_text(markdown)
+    return markdown
+
+
+def html_to_markdown_many(htmls: List[str]) -> List[Union[str, BaseException]]:
+    """
+    Convert several HTML documents to Markdown, in parallel for large batches.
+
+    Args:
+        htmls: HTML strings to convert
+
+    Returns:
+        One entry per document, in input order: the Markdown, or the
+        exception raised while converting that document
+    """
+    workers = min(os.cpu_count() or 1, len(htmls))
+
+    if len(htmls) <= PARALLEL_THRESHOLD or workers < 2:
+        results = []
+        for html in htmls:
+            try:
+                results.append(html_to_markdown(html))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(html_to_markdown, html) for html in htmls]
+        return [future.exception() or future.result() for future in futures]
@@ -0,0 +1,155 @@
+"""
+Process-wide MySQL connection pool shared by the IndoMonitor scripts.
+
+Opening a pymysql connection costs a TCP handshake plus MySQL authentication,
+which dominates the runtime of one-shot commands like `add site`. The pool is
+created lazily on first use and kept in this module's globals, so every
+command executed within the same process reuses the already-open connections
+instead of reconnecting.
+
+Usage:
+  from _pool import get_pooled_connection
+
+  pool = get_pooled_connection(config)
+  connection = pool.get_conn()
+  try:
+      ...
+  finally:
+      pool.release(connection)
+"""
+
+import atexit
+import queue
+import threading
+from typing import Dict, Any, Optional
+
+import pymysql
+
+from _db_common import get_connection
+
+
+class ConnectionPool:
+    """
+    Minimal thread-safe pool of pymysql connections for a single server.
+
+    Idle connections are kept in a LIFO queue so the most recently used
+    (and therefore most likely still alive) connection is handed out first.
+    Every connection is pinged before it is returned, which transparently
+    reconnects connections dropped by the server's `wait_timeout`.
+    """
+
+    def __init__(self, config: Dict[str, Any], min_size: int = 1, max_size: int = 10,
+                 database: Optional[str] = None):
+        self.config = config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.database = database
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=max_size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> pymysql.connections.Connection:
+        """Open a new connection and count it against max_size."""
+        connection = get_connection(self.config, database=self.database)
+        with self._lock:
+            self._created += 1
+        return connection
+
+    def init(self) -> None:
+        """Pre-create min_size connections."""
+        while self._created < self.min_size:
+            self._idle.put(self._connect())
+
+    def get_conn(self, timeout: Optional[float] = None) -> pymysql.connections.Connection:
+        """
+        Borrow a connection from the pool.
+
+        Args:
+            timeout: Seconds to wait for a free connection once max_size
+                connections are in use (None waits forever)
+
+        Returns:
+            An open pymysql connection
+        """
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.max_size
+            if can_create:
+                return self._connect()
+            connection = self._idle.get(timeout=timeout)
+
+        # Reconnects in place if the server closed the idle connection
+        try:
+            connection.ping(reconnect=True)
+        except pymysql.Error:
+            # Give the slot back before opening a replacement, so a brief
+            # outage does not use up max_size for good
+            try:
+                connection.close()
+            except pymysql.Error:
+                pass
+            with self._lock:
+                self._created -= 1
+            return self._connect()
+        return connection
+
+    def release(self, connection: pymysql.connections.Connection) -> None:
+        """Return a borrowed connection to the pool."""
+        if not connection.open:
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put(connection)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                connection.close()
+            except pymysql.Error:
+                pass
+            with self._lock:
+                self._created -= 1
+
+
+# One pool per (connection name, database), shared by the whole process
+_pools: Dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pooled_connection(config: Dict[str, Any], database: Optional[str] = None) -> ConnectionPool:
+    """
+    Get the process-wide pool for a connection config, creating it on first use.
+
+    Args:
+        config: Connection configuration from get_connection_config()
+        database: Optional database name to auto-select on each connection
+
+    Returns:
+        ConnectionPool for the given server
+    """
+    key = (config['name'], database)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(config, database=database)
+            pool.init()
+            _pools[key] = pool
+    return pool
+
+
+def close_all_pools() -> None:
+    """Close every pool created in this process."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+atexit.register(close_all_pools)
@@ -0,0 +1,232 @@
+"""
+News site helpers for the IndoMonitor CLI.
+
+URL validation/normalization and the queries against
+indomonitor.news_sites used by the 'add' and 'list' commands.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set, Tuple
+
+# [scheme://]host[:port][/path?query#fragment], matched once instead of
+# running urlparse() twice per URL
+_URL_RE = re.compile(
+    r'^(?:(?P<scheme>[a-z][a-z0-9+.-]*)://)?'
+    r'(?P<host>[^\s/:?#@]+)'
+    r'(?P<port>:\d+)?'
+    r'(?P<rest>[/?#]\S*)?$',
+    re.IGNORECASE
+)
+
+# Row of indomonitor.news_sites as returned by check_site_exists(); a tuple
+# subclass, so no per-row dict is built
+Site = namedtuple('Site', 'id url name status')
+
+# Max URLs per "WHERE url IN (...)" lookup, keeps the statement well below max_allowed_packet
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# Max rows per multi-row INSERT issued by add_sites()
+INSERT_CHUNK_SIZE = 500
+
+
+def _validate_url(url: str) -> Tuple[bool, Optional[str], str]:
+    """Uncached implementation of validate_url() and validate_url_batch()."""
+    match = _URL_RE.match(url)
+    if not match:
+        return False, None, url
+
+    scheme, host, port, rest = match.groups()
+    scheme = (scheme or 'https').lower()
+    if scheme not in ('http', 'https'):
+        return False, None, url
+
+    host = host.lower()
+    url = f"{scheme}://{host}{port or ''}{rest or ''}"
+
+    # Extract domain (remove www. prefix if present)
+    domain = host[4:] if host.startswith('www.') else host
+
+    return True, domain, url
+
+
+@lru_cache(maxsize=4096)
+def validate_url(url: str) -> Tuple[bool, Optional[str], str]:
+    """
+    Validate URL format and extract domain name.
+    Automatically prepends https:// if scheme is missing.
+
+    Scheme and host are lowercased in the normalized URL. Results are cached,
+    since add_site() re-validates URLs the commands already checked.
+
+    Returns:
+        Tuple of (is_valid, domain_name, normalized_url)
+    """
+    return _validate_url(url)
+
+
+def validate_url_batch(urls: Iterable[str]) -> List[Tuple[bool, Optional[str], str]]:
+    """
+    Validate many URLs at once, e.g. for bulk ingestion via 'add sites'.
+
+    Same results as calling validate_url() per URL, but without going
+    through the lru_cache, which a large list of distinct URLs would only
+    churn.
+
+    Returns:
+        One (is_valid, domain_name, normalized_url) tuple per input URL
+    """
+    return [_validate_url(url) for url in urls]
+
+
+def extract_site_name_from_domain(domain: str) -> str:
+    """
+    Derive a human-readable site name from an already validated domain.
+
+    e.g. "news.example.com" -> "News Example"
+    """
+    if not domain:
+        return "Unknown Site"
+
+    # Remove TLD (.com, .org, etc.) and capitalize
+    name_parts = domain.rsplit('.', 1)[0].split('.')
+    return ' '.join(part.capitalize() for part in name_parts)
+
+
+def extract_site_name(url: str) -> str:
+    """
+    Extract a human-readable site name from URL.
+
+    Returns site name derived from domain. Callers that already ran
+    validate_url() should use extract_site_name_from_domain() directly.
+    """
+    return extract_site_name_from_domain(validate_url(url)[1] or "")
+
+
+def check_site_exists(connection, url: str) -> Optional[Site]:
+    """
+    Check if a site with the given URL already exists.
+
+    Looks the URL up by its url_hash, the column the unique key is on, so
+    this finds exactly the row an add_site() conflict was reported for.
+
+    Returns:
+        Site with the stored row if it exists, None otherwise
+    """
+    sql = "SELECT id, url, name, status FROM indomonitor.news_sites WHERE url_hash = SHA2(%s, 256)"
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, (url,))
+        row = cursor.fetchone()
+
+        return Site(*row) if row else None
+
+
+def add_site(connection, url: str, name: Optional[str] = None, status: str = 'pending') -> Tuple[int, bool]:
+    """
+    Add a new news site to the database, unless its URL is already stored.
+
+    Relies on the unique_url_hash key over the full URL's hash: a duplicate
+    turns the INSERT into a no-op update that sets LAST_INSERT_ID() to the
+    existing row's id, so insert and duplicate check cost a single round-trip.
+
+    Returns:
+        Tuple of (site_id, inserted); site_id is the existing site's ID
+        when inserted is False
+    """
+    # Use provided name or extract from URL
+    if not name:
+        name = extract_site_name(url)
+
+    # updated_at is filled in by the server
+    sql = """
+        INSERT INTO indomonitor.news_sites
+        (url, name, status, updated_at)
+        VALUES (%s, %s, %s, NOW())
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
+    """
+
+    # Connections run in autocommit mode, so the INSERT is committed as it executes
+    with connection.cursor() as cursor:
+        cursor.execute(sql, (url, name, status))
+
+        # Affected rows: 1 for an insert, 0 when the duplicate row was left
+        # unchanged (pymysql does not set CLIENT_FOUND_ROWS)
+        inserted = cursor.rowcount == 1
+        site_id = cursor.lastrowid
+
+        return site_id, inserted
+
+
+def find_existing_urls(connection, urls: Iterable[str]) -> Set[str]:
+    """
+    Find which of the given URLs are already stored in news_sites.
+
+    Uses one parameterized IN lookup on the indexed url_hash per chunk
+    instead of a check_site_exists() round-trip per URL.
+
+    Returns:
+        Set of URLs that already exist
+    """
+    urls = list(urls)
+    existing = set()
+
+    with connection.cursor() as cursor:
+        for i in range(0, len(urls), IN_CLAUSE_CHUNK_SIZE):
+            chunk = urls[i:i + IN_CLAUSE_CHUNK_SIZE]
+            placeholders = ','.join(['SHA2(%s, 256)'] * len(chunk))
+            cursor.execute(
+                f"SELECT url FROM indomonitor.news_sites WHERE url_hash IN ({placeholders})",
+                chunk
+            )
+            existing.update(row[0] for row in cursor.fetchall())
+
+    return existing
+
+
+def add_sites(connection, sites: List[Tuple[str, str]], status: str = 'pending') -> int:
+    """
+    Add several news sites in a single transaction.
+
+    Rows are sent as multi-row INSERTs of up to INSERT_CHUNK_SIZE rows, so
+    the whole batch costs one round-trip per chunk and one commit. Rows
+    colliding with a unique key are skipped instead of failing the batch.
+
+    Args:
+        connection: Open database connection
+        sites: List of (url, name) tuples
+        status: Initial status for all sites
+
+    Returns:
+        Number of rows inserted
+    """
+    inserted = 0
+
+    # Connections run in autocommit mode; an explicit transaction keeps a
+    # multi-chunk batch all-or-nothing
+    connection.begin()
+    try:
+        with connection.cursor() as cursor:
+            for i in range(0, len(sites), INSERT_CHUNK_SIZE):
+                chunk = sites[i:i + INSERT_CHUNK_SIZE]
+                # The VALUES list is built here rather than via executemany():
+                # pymysql only batches rows whose VALUES are all placeholders,
+                # and updated_at comes from NOW() on the server
+                values = ','.join(['(%s, %s, %s, NOW())'] * len(chunk))
+                params = [value for url, name in chunk for value in (url, name, status)]
+                inserted += cursor.execute(
+                    f"""
+                    INSERT INTO indomonitor.news_sites
+                    (url, name, status, updated_at)
+                    VALUES {values}
+                    ON DUPLICATE KEY UPDATE id = id
+                    """,
+                    params
+                )
+            connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+
+    return inserted
@@ -0,0 +1,410 @@
+"""
+Splash rendering client for the IndoMonitor CLI.
+
+Provides a synchronous fetch for single URLs and an asyncio-based batch
+fetch that renders several URLs concurrently over one pooled
+httpx.AsyncClient.
+
+Rendered pages are cached on disk (zstd-compressed) under
+~/.cache/indomonitor/splash, keyed by (url, wait):
+  SPLASH_CACHE_TTL        Seconds a cached render stays valid (default: 3600, 0 disables reads)
+  SPLASH_CACHE_MAX_BYTES  Size cap of the cache directory (default: 256 MiB);
+                          least recently written entries are evicted first
+
+Overload responses (429/502/503/504) and connection failures are retried
+up to $SPLASH_RETRIES times (default: 4) with exponential backoff.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import itertools
+import os
+import random
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+import httpx
+import zstandard
+
+# Splash server configuration
+SPLASH_URL = "http://vosscloud:32768"
+
+# Default number of renders in flight at once (override with $SPLASH_CONCURRENCY).
+# Splash queues requests beyond its slot count (default 50) and latency grows
+# quickly once it does, so stay well below that.
+DEFAULT_SPLASH_CONCURRENCY = 10
+
+# Transient Splash failures are retried with exponential backoff (honouring
+# Retry-After) up to $SPLASH_RETRIES times, so an overloaded Splash costs a
+# short sleep instead of a failed command
+DEFAULT_SPLASH_RETRIES = 4
+MAX_RETRY_DELAY = 30
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# Shared synchronous client, created on first use by _get_splash_client()
+_SPLASH_CLIENT: Optional[httpx.Client] = None
+
+# On-disk render cache
+CACHE_DIR = Path("~/.cache/indomonitor/splash").expanduser()
+DEFAULT_CACHE_TTL = 3600
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _cache_path(url: str, wait: float) -> Path:
+    """Get the cache file path for a rendered (url, wait) pair."""
+    key = hashlib.sha256(f"{url}|{wait}".encode()).hexdigest()
+    return CACHE_DIR / f"{key}.html.zst"
+
+
+def read_cached_html(url: str, wait: float) -> Optional[str]:
+    """
+    Return the cached render of a URL, or None if missing or expired.
+    """
+    ttl = int(os.getenv('SPLASH_CACHE_TTL', DEFAULT_CACHE_TTL))
+    path = _cache_path(url, wait)
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        # decompressobj() also handles streamed frames without a content size
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(path.read_bytes())
+        return data.decode('utf-8')
+    except (OSError, zstandard.ZstdError, UnicodeDecodeError):
+        # Missing or corrupt entries are treated as a cache miss
+        return None
+
+
+def write_cached_html(url: str, wait: float, html: str) -> None:
+    """
+    Store a rendered page in the cache.
+
+    Writes to a temporary file first and renames it into place, so concurrent
+    readers never see a partially written entry. Cache failures never break
+    the fetch itself.
+    """
+    path = _cache_path(url, wait)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(zstandard.compress(html.encode('utf-8')))
+        os.replace(tmp_path, path)
+        _evict_cache()
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _tee_to_cache(url: str, wait: float, chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Pass text chunks through while compressing them into the cache.
+
+    The entry is only renamed into place once the stream has been consumed
+    completely; an interrupted stream leaves no (truncated) cache entry.
+    """
+    path = _cache_path(url, wait)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        writer = zstandard.ZstdCompressor().stream_writer(open(tmp_path, 'wb'))
+    except OSError:
+        yield from chunks
+        return
+
+    completed = False
+    try:
+        for chunk in chunks:
+            if writer is not None:
+                try:
+                    writer.write(chunk.encode('utf-8'))
+                except OSError:
+                    # Cache failures never break the fetch itself
+                    writer.close()
+                    writer = None
+            yield chunk
+        completed = writer is not None
+    finally:
+        try:
+            if writer is not None:
+                writer.close()
+            if completed:
+                os.replace(tmp_path, path)
+                _evict_cache()
+        except OSError:
+            completed = False
+        if not completed:
+            tmp_path.unlink(missing_ok=True)
+
+
+def _evict_cache() -> None:
+    """Delete the oldest cache entries until the directory fits SPLASH_CACHE_MAX_BYTES."""
+    max_bytes = int(os.getenv('SPLASH_CACHE_MAX_BYTES', DEFAULT_CACHE_MAX_BYTES))
+    entries = []
+    total = 0
+    for entry in os.scandir(CACHE_DIR):
+        if entry.name.endswith('.html.zst'):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+    if total <= max_bytes:
+        return
+
+    for _, size, entry_path in sorted(entries):
+        try:
+            os.unlink(entry_path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+def _get_splash_client() -> httpx.Client:
+    """
+    Get the process-wide Splash client.
+
+    One keep-alive client is reused for every synchronous render, so
+    repeated fetches in one process (daemon mode) skip the TCP handshake.
+    """
+    global _SPLASH_CLIENT
+    if _SPLASH_CLIENT is None:
+        _SPLASH_CLIENT = httpx.Client(
+            base_url=SPLASH_URL,
+            limits=httpx.Limits(
+                max_keepalive_connections=16,
+                max_connections=16,
+                keepalive_expiry=60.0
+            ),
+            timeout=httpx.Timeout(40.0, connect=5.0)
+        )
+    return _SPLASH_CLIENT
+
+
+def _close_splash_client() -> None:
+    """Close the shared Splash client if it was created."""
+    if _SPLASH_CLIENT is not None:
+        _SPLASH_CLIENT.close()
+
+
+atexit.register(_close_splash_client)
+
+
+def _retry_delay(attempt: int, error: httpx.HTTPError) -> Optional[float]:
+    """
+    Get the seconds to wait before retrying a failed render.
+
+    Args:
+        attempt: Zero-based number of the attempt that just failed
+        error: Exception raised by that attempt
+
+    Returns:
+        Delay in seconds, or None if the error should not be retried
+    """
+    if attempt >= int(os.getenv('SPLASH_RETRIES', DEFAULT_SPLASH_RETRIES)):
+        return None
+
+    if isinstance(error, httpx.HTTPStatusError):
+        if error.response.status_code not in RETRY_STATUS_CODES:
+            return None
+        retry_after = error.response.headers.get('Retry-After')
+    elif isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+        retry_after = None
+    else:
+        return None
+
+    try:
+        delay = float(retry_after) if retry_after else 2 ** attempt
+    except ValueError:
+        # Retry-After given as an HTTP date
+        delay = 2 ** attempt
+
+    # Jitter keeps parallel clients from retrying in lockstep
+    return min(delay, MAX_RETRY_DELAY) + random.random()
+
+
+def _render_params(url: str, wait: float, timeout: int) -> dict:
+    """Build the query parameters for Splash's render.html endpoint."""
+    return {
+        "url": url,
+        "wait": wait,
+        "timeout": timeout,
+        "images": 0  # Disable images for faster rendering
+    }
+
+
+def fetch_html_via_splash(url: str, wait: float = 2.0, timeout: int = 30,
+                          use_cache: bool = True, refresh: bool = False) -> str:
+    """
+    Fetch and render a URL via Splash, returning the rendered HTML.
+
+    Args:
+        url: The URL to fetch
+        wait: Time in seconds to wait after page load (default: 2.0)
+        timeout: Maximum time in seconds for rendering (default: 30)
+        use_cache: Read from and write to the on-disk render cache
+        refresh: Skip the cache lookup but still store the new render
+
+    Returns:
+        Rendered HTML as string
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    if use_cache and not refresh:
+        cached = read_cached_html(url, wait)
+        if cached is not None:
+            return cached
+
+    for attempt in itertools.count():
+        try:
+            response = _get_splash_client().get(
+                "/render.html",
+                params=_render_params(url, wait, timeout),
+                timeout=timeout + 10  # Client timeout slightly longer than server timeout
+            )
+            response.raise_for_status()
+            break
+        except httpx.HTTPError as e:
+            delay = _retry_delay(attempt, e)
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+    if use_cache:
+        write_cached_html(url, wait, response.text)
+    return response.text
+
+
+def stream_html_via_splash(url: str, wait: float = 2.0, timeout: int = 30,
+                           use_cache: bool = True, refresh: bool = False,
+                           chunk_size: int = 65536) -> Iterator[str]:
+    """
+    Fetch and render a URL via Splash, yielding the rendered HTML in chunks.
+
+    Unlike fetch_html_via_splash() the page is never held in memory as a
+    whole, so callers can write or convert it while it downloads.
+
+    Args:
+        url: The URL to fetch
+        wait: Time in seconds to wait after page load (default: 2.0)
+        timeout: Maximum time in seconds for rendering (default: 30)
+        use_cache: Read from and write to the on-disk render cache
+        refresh: Skip the cache lookup but still store the new render
+        chunk_size: Approximate size of the yielded chunks
+
+    Yields:
+        Decoded chunks of the rendered HTML
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    if use_cache and not refresh:
+        cached = read_cached_html(url, wait)
+        if cached is not None:
+            yield cached
+            return
+
+    for attempt in itertools.count():
+        streaming = False
+        try:
+            with _get_splash_client().stream(
+                "GET",
+                "/render.html",
+                params=_render_params(url, wait, timeout),
+                timeout=timeout + 10
+            ) as response:
+                response.raise_for_status()
+                streaming = True
+                chunks = response.iter_text(chunk_size)
+                if use_cache:
+                    chunks = _tee_to_cache(url, wait, chunks)
+                yield from chunks
+                return
+        except httpx.HTTPError as e:
+            # Once chunks have been handed out the render cannot be restarted
+            delay = None if streaming else _retry_delay(attempt, e)
+            if delay is None:
+                raise
+            time.sleep(delay)
+
+
+async def fetch_html_via_splash_async(client: httpx.AsyncClient, url: str,
+                                      wait: float = 2.0, timeout: int = 30) -> str:
+    """
+    Async variant of fetch_html_via_splash() using a shared client.
+
+    Args:
+        client: AsyncClient created with base_url=SPLASH_URL
+        url: The URL to fetch
+        wait: Time in seconds to wait after page load (default: 2.0)
+        timeout: Maximum time in seconds for rendering (default: 30)
+
+    Returns:
+        Rendered HTML as string
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    response = await client.get(
+        "/render.html",
+        params=_render_params(url, wait, timeout),
+        timeout=timeout + 10
+    )
+    response.raise_for_status()
+    return response.text
+
+
+async def _fetch_all(urls: List[str], wait: float, timeout: int,
+                     use_cache: bool, refresh: bool) -> List[Union[str, BaseException]]:
+    """Render all URLs concurrently, bounded by $SPLASH_CONCURRENCY."""
+    concurrency = int(os.getenv('SPLASH_CONCURRENCY', DEFAULT_SPLASH_CONCURRENCY))
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(
+        max_keepalive_connections=concurrency,
+        max_connections=concurrency
+    )
+
+    # The client is bound to the running event loop, so it is created per batch
+    async with httpx.AsyncClient(base_url=SPLASH_URL, limits=limits) as client:
+        async def fetch(url: str) -> str:
+            if use_cache and not refresh:
+                cached = read_cached_html(url, wait)
+                if cached is not None:
+                    return cached
+
+            for attempt in itertools.count():
+                try:
+                    async with semaphore:
+                        html = await fetch_html_via_splash_async(client, url, wait, timeout)
+                    break
+                except httpx.HTTPError as e:
+                    delay = _retry_delay(attempt, e)
+                    if delay is None:
+                        raise
+                    # Back off outside the semaphore so other renders can proceed
+                    await asyncio.sleep(delay)
+
+            if use_cache:
+                write_cached_html(url, wait, html)
+            return html
+
+        return await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+
+
+def fetch_many_via_splash(urls: List[str], wait: float = 2.0, timeout: int = 30,
+                          use_cache: bool = True, refresh: bool = False) -> List[Union[str, BaseException]]:
+    """
+    Fetch and render several URLs via Splash concurrently.
+
+    Args:
+        urls: URLs to fetch
+        wait: Time in seconds to wait after page load (default: 2.0)
+        timeout: Maximum time in seconds for rendering (default: 30)
+        use_cache: Read from and write to the on-disk render cache
+        refresh: Skip the cache lookup but still store the new renders
+
+    Returns:
+        One entry per URL, in input order: the rendered HTML, or the
+        exception raised while fetching that URL
+    """
+    return asyncio.run(_fetch_all(urls, wait, timeout, use_cache, refresh))
@@ -6,6 +6,7 @@
 #   "pyyaml",
 #   "httpx",
 #   "html2text",
+#   "zstandard",
 # ]
 # ///
 """
@@ -26,211 +27,93 @@ Usage:
   # Get rendered HTML converted to Markdown
   ./scripts/indomonitor.py get md https://example.com
 
+  # Keep the CLI resident and send commands through the fast launcher
+  ./scripts/indomonitor.py serve &
+  ./scripts/indomonitor-cli list news_sites
+
   # Show help
   ./scripts/indomonitor.py -h
   ./scripts/indomonitor.py add site -h
 
 Commands:
   add site <url>     Add a new news site to the monitoring system
+  add sites          Add news sites from stdin or --file, one URL per line
   list news_sites    List all news site URLs
-  get <url>          Fetch and render a URL via Splash, return HTML
-  get md <url>       Fetch and render a URL via Splash, return Markdown
+  get <url>...       Fetch and render URL(s) via Splash, return HTML
+  get md <url>...    Fetch and render URL(s) via Splash, return Markdown
+  serve              Run as a daemon on a Unix socket (used by indomonitor-cli)
 
 Examples:
   ./scripts/indomonitor.py add site https://news.example.com
   ./scripts/indomonitor.py add site "https://blog.example.com/news"
+  ./scripts/indomonitor.py add sites --file sites.txt
   ./scripts/indomonitor.py list news_sites
   ./scripts/indomonitor.py get https://news.example.com
   ./scripts/indomonitor.py get md https://news.example.com
+  ./scripts/indomonitor.py get md https://a.example.com https://b.example.com
+
+Several URLs passed to 'get' are rendered concurrently (at most
+$SPLASH_CONCURRENCY at a time, default 10) and printed in the given order.
+Renders are cached in ~/.cache/indomonitor/splash for $SPLASH_CACHE_TTL
+seconds (default 3600); use --refresh to re-render or --no-cache to bypass.
 """
 
 import sys
 import argparse
 from pathlib import Path
-from urllib.parse import urlparse
-from datetime import datetime
-from typing import Optional, Tuple
-import httpx
-import html2text
+from typing import Optional
 
-# Add scripts directory to path to import manage_db
+# Add scripts directory to path to import the shared helper modules
 sys.path.insert(0, str(Path(__file__).parent))
 
-# Import from manage_db.py
-from manage_db import (
-    load_environment,
-    load_database_config,
-    get_connection_config,
-    get_connection,
-    execute_sql,
-    is_config_complete
-)
-
-# Splash server configuration
-SPLASH_URL = "http://vosscloud:32768"
+# Only stdlib-backed helpers are imported here. Database (pymysql, yaml,
+# dotenv via _db_common) and Splash/Markdown (httpx, zstandard, html2text)
+# modules are imported by the commands that use them, so e.g. 'get' never
+# loads the MySQL driver and 'list' never loads httpx.
+from _sites import validate_url, validate_url_batch, extract_site_name_from_domain, check_site_exists, add_site, add_sites, find_existing_urls
+from _daemon import default_socket_path, run_captured, serve_forever
+from _get_command import cmd_get
 
-
-def fetch_html_via_splash(url: str, wait: float = 2.0, timeout: int = 30) -> str:
+def get_site_pool():
     """
-    Fetch and render a URL via Splash, returning the rendered HTML.
-
-    Args:
-        url: The URL to fetch
-        wait: Time in seconds to wait after page load (default: 2.0)
-        timeout: Maximum time in seconds for rendering (default: 30)
-
-    Returns:
-        Rendered HTML as string
+    Get the connection pool for the default database server.
 
-    Raises:
-        httpx.HTTPError: If the request fails
+    Loads the environment and database config, validates it and exits with
+    an error message if the configuration is unusable.
     """
-    response = httpx.get(
-        f"{SPLASH_URL}/render.html",
-        params={
-            "url": url,
-            "wait": wait,
-            "timeout": timeout,
-            "images": 0  # Disable images for faster rendering
-        },
-        timeout=timeout + 10  # Client timeout slightly longer than server timeout
+    from _db_common import (
+        load_environment,
+        load_database_config,
+        get_connection_config,
+        is_config_complete
     )
-    response.raise_for_status()
-    return response.text
-
-
-def html_to_markdown(html: str) -> str:
-    """
-    Convert HTML to Markdown format.
-
-    Args:
-        html: HTML string to convert
-
-    Returns:
-        Markdown formatted string
-    """
-    h = html2text.HTML2Text()
-    h.ignore_links = False
-    h.ignore_images = False
-    h.ignore_emphasis = False
-    h.body_width = 0  # Don't wrap lines
-    return h.handle(html)
+    from _pool import get_pooled_connection
 
+    # Load environment and config
+    load_environment()
+    db_config = load_database_config()
+    server_name = db_config.get('default_connection', 'vosscloud')
 
-def validate_url(url: str) -> Tuple[bool, Optional[str], str]:
-    """
-    Validate URL format and extract domain name.
-    Automatically prepends https:// if scheme is missing.
-
-    Returns:
-        Tuple of (is_valid, domain_name, normalized_url)
-    """
+    # Get connection config
     try:
-        # First, try parsing as-is
-        parsed = urlparse(url)
-
-        # If no scheme, prepend https://
-        if not parsed.scheme:
-            url = f"https://{url}"
-            parsed = urlparse(url)
-
-        # Check if netloc is present after normalization
-        if not parsed.netloc:
-            return False, None, url
-
-        # Check if scheme is http or https
-        if parsed.scheme not in ['http', 'https']:
-            return False, None, url
-
-        # Extract domain (remove www. prefix if present)
-        domain = parsed.netloc
-        if domain.startswith('www.'):
-            domain = domain[4:]
-
-        return True, domain, url
-
-    except Exception:
-        return False, None, url
-
-
-def extract_site_name(url: str) -> str:
-    """
-    Extract a human-readable site name from URL.
-
-    Returns site name derived from domain.
-    """
-    is_valid, domain, _ = validate_url(url)
-
-    if not is_valid or not domain:
-        return "Unknown Site"
-
-    # Remove TLD and capitalize
-    # e.g., "news.example.com" -> "News Example"
-    parts = domain.split('.')
-    if len(parts) > 1:
-        # Remove TLD (.com, .org, etc.)
-        name_parts = parts[:-1]
-    else:
-        name_parts = parts
-
-    # Capitalize and join
-    name = ' '.join(part.capitalize() for part in name_parts)
-
-    return name
-
-
-def check_site_exists(connection, url: str) -> Optional[dict]:
-    """
-    Check if a site with the given URL already exists.
-
-    Returns:
-        Dict with site info if exists, None otherwise
-    """
-    sql = "SELECT id, url, name, status FROM indomonitor.news_sites WHERE url = %s"
-
-    with connection.cursor() as cursor:
-        cursor.execute(sql, (url,))
-        result = cursor.fetchone()
-
-        if result:
-            return {
-                'id': result[0],
-                'url': result[1],
-                'name': result[2],
-                'status': result[3]
-            }
-
-        return None
-
-
-def add_site(connection, url: str, name: Optional[str] = None, status: str = 'pending') -> int:
-    """
-    Add a new news site to the database.
-
-    Returns:
-        The ID of the newly inserted site
-    """
-    # Use provided name or extract from URL
-    if not name:
-        name = extract_site_name(url)
-
-    # Get current timestamp for updated_at
-    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    sql = """
-        INSERT INTO indomonitor.news_sites
-        (url, name, status, updated_at)
-        VALUES (%s, %s, %s, %s)
-    """
-
-    with connection.cursor() as cursor:
-        cursor.execute(sql, (url, name, status, now))
-        connection.commit()
+        config = get_connection_config(server_name, db_config)
+    except Exception as e:
+        print(f"Error loading config: {e}", file=sys.stderr)
+        sys.exit(1)
 
-        # Get the inserted ID
-        site_id = cursor.lastrowid
+    # Check if config is complete
+    is_complete, missing_vars = is_config_complete(config)
+    if not is_complete:
+        print(f"Error: Configuration incomplete for {server_name}", file=sys.stderr)
+        print(f"Missing: {', '.join(missing_vars)}", file=sys.stderr)
+        sys.exit(1)
 
-        return site_id
+    # Process-wide pool, so repeated commands reuse open connections
+    try:
+        return get_pooled_connection(config)
+    except Exception as e:
+        print(f"Error connecting to database: {e}", file=sys.stderr)
+        sys.exit(1)
 
 
 def cmd_add_site(args):
@@ -247,48 +130,29 @@ def cmd_add_site(args):
     # Use the normalized URL
     url = normalized_url
 
-    # Load environment and config
-    load_environment()
-    db_config = load_database_config()
-    server_name = db_config.get('default_connection', 'vosscloud')
-
-    # Get connection config
-    try:
-        config = get_connection_config(server_name)
-    except Exception as e:
-        print(f"Error loading config: {e}", file=sys.stderr)
-        sys.exit(1)
-
-    # Check if config is complete
-    is_complete, missing_vars = is_config_complete(config)
-    if not is_complete:
-        print(f"Error: Configuration incomplete for {server_name}", file=sys.stderr)
-        print(f"Missing: {', '.join(missing_vars)}", file=sys.stderr)
-        sys.exit(1)
-
-    # Connect to database
+    pool = get_site_pool()
     try:
-        connection = get_connection(config)
+        connection = pool.get_conn()
     except Exception as e:
         print(f"Error connecting to database: {e}", file=sys.stderr)
         sys.exit(1)
 
     try:
-        # Check if site already exists
-        existing_site = check_site_exists(connection, url)
+        # Insert, or find out that the site already exists, in one statement
+        site_name = extract_site_name_from_domain(domain)
+        site_id, inserted = add_site(connection, url, site_name)
 
-        if existing_site:
+        if not inserted:
+            # Only look up the details when there is something to show
+            existing_site = check_site_exists(connection, url)
             print(f"Site already exists:")
-            print(f"  ID:     {existing_site['id']}")
-            print(f"  URL:    {existing_site['url']}")
-            print(f"  Name:   {existing_site['name']}")
-            print(f"  Status: {existing_site['status']}")
+            print(f"  ID:     {site_id}")
+            if existing_site:
+                print(f"  URL:    {existing_site.url}")
+                print(f"  Name:   {existing_site.name}")
+                print(f"  Status: {existing_site.status}")
             sys.exit(0)
 
-        # Add new site
-        site_id = add_site(connection, url)
-        site_name = extract_site_name(url)
-
         print(f"Successfully added new site:")
         print(f"  ID:     {site_id}")
         print(f"  URL:    {url}")
@@ -300,33 +164,82 @@ def cmd_add_site(args):
         sys.exit(1)
 
     finally:
-        connection.close()
+        pool.release(connection)
 
 
-def cmd_list_news_sites(args):
-    """Handle 'list news_sites' command."""
-    # Load environment and config
-    load_environment()
-    db_config = load_database_config()
-    server_name = db_config.get('default_connection', 'vosscloud')
+def cmd_add_sites(args):
+    """Handle 'add sites' command (bulk insert from a file or stdin)."""
+    if args.file:
+        try:
+            with open(args.file, encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError as e:
+            print(f"Error reading {args.file}: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        lines = sys.stdin.readlines()
 
-    # Get connection config
+    # Validate and normalize; skip blank lines and comments
+    raw_urls = [url for url in (line.strip() for line in lines) if url and not url.startswith('#')]
+
+    domains = {}  # normalized URL -> domain, de-duplicated in input order
+    invalid = []
+    for url, (is_valid, domain, normalized_url) in zip(raw_urls, validate_url_batch(raw_urls)):
+        if is_valid:
+            domains[normalized_url] = domain
+        else:
+            invalid.append(url)
+
+    for url in invalid:
+        print(f"Error: Invalid URL format: {url}", file=sys.stderr)
+
+    urls = list(domains)
+
+    if not urls:
+        sys.exit(1 if invalid else 0)
+
+    pool = get_site_pool()
     try:
-        config = get_connection_config(server_name)
+        connection = pool.get_conn()
     except Exception as e:
-        print(f"Error loading config: {e}", file=sys.stderr)
+        print(f"Error connecting to database: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Check if config is complete
-    is_complete, missing_vars = is_config_complete(config)
-    if not is_complete:
-        print(f"Error: Configuration incomplete for {server_name}", file=sys.stderr)
-        print(f"Missing: {', '.join(missing_vars)}", file=sys.stderr)
+    try:
+        existing = find_existing_urls(connection, urls)
+        new_sites = [(url, extract_site_name_from_domain(domains[url]))
+                     for url in urls if url not in existing]
+        inserted = add_sites(connection, new_sites)
+
+        # Rows the INSERT skipped were stored since the lookup above (e.g.
+        # by a concurrent 'add'); which ones is not reported by the server
+        skipped = len(new_sites) - inserted
+        if skipped:
+            print(f"Warning: {skipped} site(s) were added concurrently and skipped", file=sys.stderr)
+        else:
+            for url, name in new_sites:
+                print(f"Added: {url} ({name})")
+        print(f"Added {inserted} new site(s), {len(existing) + skipped} already existed, "
+              f"{len(invalid)} invalid")
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    finally:
+        pool.release(connection)
+
+    if invalid:
         sys.exit(1)
 
-    # Connect to database
+
+def cmd_list_news_sites(args):
+    """Handle 'list news_sites' command."""
+    from pymysql.cursors import SSCursor
+
+    pool = get_site_pool()
     try:
-        connection = get_connection(config)
+        connection = pool.get_conn()
     except Exception as e:
         print(f"Error connecting to database: {e}", file=sys.stderr)
         sys.exit(1)
@@ -335,86 +248,62 @@ def cmd_list_news_sites(args):
         # Query news sites
         sql = "SELECT url FROM indomonitor.news_sites WHERE status != 'deleted' ORDER BY id"
 
-        with connection.cursor() as cursor:
+        # Server-side cursor: rows are streamed instead of materialized with
+        # fetchall(), so output starts (e.g. into `| xargs ... get md`) before
+        # the whole result set has arrived and memory use stays flat
+        with connection.cursor(SSCursor) as cursor:
             cursor.execute(sql)
-            results = cursor.fetchall()
 
-            # Print URLs, one per line
-            for row in results:
-                print(row[0])
-
-            # If no results, exit silently (no output)
-            if not results:
-                sys.exit(0)
+            # Print URLs, one per line, with one write per batch of rows:
+            # per-row print() calls dominate the runtime for large site lists.
+            # No rows means no output.
+            sys.stdout.flush()
+            out = sys.stdout.buffer
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                out.write(b'\n'.join(row[0].encode('utf-8') for row in rows) + b'\n')
+                out.flush()
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
     finally:
-        connection.close()
-
+        pool.release(connection)
 
-def cmd_get(args):
-    """Handle 'get' command and 'get md' subcommand."""
-    # Parse the arguments manually to handle both 'get <url>' and 'get md <url>'
-    arguments = args.args
 
-    if len(arguments) < 1:
-        print("Error: URL required", file=sys.stderr)
-        print("Usage: ./scripts/indomonitor.py get <url>", file=sys.stderr)
-        print("       ./scripts/indomonitor.py get md <url>", file=sys.stderr)
-        sys.exit(1)
-
-    # Check if first argument is 'md' (subcommand)
-    if arguments[0] == 'md':
-        # This is 'get md <url>'
-        if len(arguments) < 2:
-            print("Error: URL required for 'get md' command", file=sys.stderr)
-            print("Usage: ./scripts/indomonitor.py get md <url>", file=sys.stderr)
-            sys.exit(1)
-
-        url = arguments[1]
-        output_format = 'markdown'
-    else:
-        # This is 'get <url>'
-        url = arguments[0]
-        output_format = 'html'
-
-    # Validate URL format and get normalized URL
-    is_valid, domain, normalized_url = validate_url(url)
-    if not is_valid:
-        print(f"Error: Invalid URL format: {url}", file=sys.stderr)
-        print("URL must be a valid domain or http:// / https:// URL", file=sys.stderr)
-        sys.exit(1)
+def cmd_serve(args):
+    """Handle 'serve' command: keep the CLI resident behind a Unix socket."""
+    socket_path = Path(args.socket) if args.socket else default_socket_path('indomonitor')
 
-    # Use the normalized URL
-    url = normalized_url
-
-    # Fetch HTML via Splash
+    # Warm up everything a command would otherwise pay for on each call:
+    # .env, database config and the first pooled connection
     try:
-        html = fetch_html_via_splash(url)
-    except httpx.HTTPError as e:
-        print(f"Error fetching URL via Splash: {e}", file=sys.stderr)
-        sys.exit(1)
-    except Exception as e:
-        print(f"Unexpected error: {e}", file=sys.stderr)
+        pool = get_site_pool()
+        pool.release(pool.get_conn())
+    except SystemExit:
+        print("Warning: database unavailable, DB commands will report errors", file=sys.stderr)
+
+    def handle(request):
+        argv = request.get('argv', [])
+        if argv[:1] == ['serve']:
+            return {'stdout': '', 'stderr': "Error: cannot run 'serve' inside the daemon\n", 'exit_code': 1}
+        return run_captured(dispatch, argv, stdin=request.get('stdin', ''), cwd=request.get('cwd'))
+
+    print(f"IndoMonitor daemon listening on {socket_path}", file=sys.stderr)
+    try:
+        serve_forever(socket_path, handle)
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Output based on format
-    if output_format == 'markdown':
-        try:
-            markdown = html_to_markdown(html)
-            print(markdown)
-        except Exception as e:
-            print(f"Error converting HTML to Markdown: {e}", file=sys.stderr)
-            sys.exit(1)
-    else:
-        print(html)
-
 
-def main():
-    """Main execution function."""
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all CLI commands."""
     parser = argparse.ArgumentParser(
         description='IndoMonitor CLI - News monitoring system management',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -458,6 +347,22 @@ def main():
 
     add_site_parser.set_defaults(func=cmd_add_site)
 
+    # 'add sites' subcommand
+    add_sites_parser = add_subparsers.add_parser(
+        'sites',
+        help='Add several news sites at once',
+        description='Add news sites from a file or stdin (one URL per line) '
+                    'in a single transaction'
+    )
+
+    add_sites_parser.add_argument(
+        '--file', '-f',
+        type=str,
+        help='File with one URL per line (default: read from stdin)'
+    )
+
+    add_sites_parser.set_defaults(func=cmd_add_sites)
+
     # 'list' command parser
     list_parser = subparsers.add_parser(
         'list',
@@ -491,13 +396,78 @@ def main():
     get_parser.add_argument(
         'args',
         nargs='+',
-        help='URL to fetch, or "md <url>" for Markdown output'
+        help='URL(s) to fetch, or "md <url>..." for Markdown output'
+    )
+
+    get_parser.add_argument(
+        '--no-cache',
+        dest='cache',
+        action='store_false',
+        help='Bypass the on-disk render cache entirely'
+    )
+
+    get_parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Re-render even if a cached copy exists, then update the cache'
     )
 
     get_parser.set_defaults(func=cmd_get)
 
-    # Parse arguments
-    args = parser.parse_args()
+    # 'serve' command parser
+    serve_parser = subparsers.add_parser(
+        'serve',
+        help='Run as a resident daemon for the indomonitor-cli launcher',
+        description='Keep the CLI loaded with an open database connection and '
+                    'execute commands received on a Unix socket'
+    )
+
+    serve_parser.add_argument(
+        '--socket',
+        type=str,
+        help='Socket path (default: $XDG_RUNTIME_DIR/indomonitor.sock)'
+    )
+
+    serve_parser.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def fast_parse(argv) -> Optional[argparse.Namespace]:
+    """
+    Resolve plain command lines without building the argparse tree.
+
+    Covers the common invocations (no options, correct argument count) and
+    returns the same Namespace argparse would. Anything else, including -h,
+    options and malformed commands, returns None so argparse handles it with
+    its usual help and error messages.
+    """
+    if not argv or any(arg.startswith('-') for arg in argv):
+        return None
+
+    command = tuple(argv[:2])
+    if command == ('add', 'site') and len(argv) == 3:
+        return argparse.Namespace(command='add', add_command='site', url=argv[2], func=cmd_add_site)
+    if command == ('add', 'sites') and len(argv) == 2:
+        return argparse.Namespace(command='add', add_command='sites', file=None, func=cmd_add_sites)
+    if command == ('list', 'news_sites') and len(argv) == 2:
+        return argparse.Namespace(command='list', list_command='news_sites', func=cmd_list_news_sites)
+    if argv[0] == 'get' and len(argv) > 1:
+        return argparse.Namespace(command='get', args=argv[1:], cache=True, refresh=False, func=cmd_get)
+    if argv == ['serve']:
+        return argparse.Namespace(command='serve', socket=None, func=cmd_serve)
+    return None
+
+
+def dispatch(argv):
+    """Parse argv and execute the selected command."""
+    args = fast_parse(argv)
+    if args is not None:
+        args.func(args)
+        return
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
 
     # Execute command
     if hasattr(args, 'func'):
@@ -507,5 +477,10 @@ def main():
         sys.exit(1)
 
 
+def main():
+    """Main execution function."""
+    dispatch(sys.argv[1:])
+
+
 if __name__ == "__main__":
     main()
@@ -4,6 +4,7 @@
 #   "pymysql",
 #   "python-dotenv",
 #   "pyyaml",
+#   "orjson",
 # ]
 # ///
 """
@@ -36,6 +37,13 @@ Usage:
   ./scripts/manage_db.py --yaml
   ./scripts/manage_db.py --sql "SHOW DATABASES" --yaml
 
+  # Stream a large result set without loading it into memory
+  ./scripts/manage_db.py --sql "SELECT * FROM indomonitor.news_scrapes" --stream --json
+
+  # Keep a daemon with pooled connections running and send queries to it
+  ./scripts/manage_db.py --daemon &
+  ./scripts/manage_db.py --client --sql "SELECT COUNT(*) FROM indomonitor.news_sites"
+
 Outputs:
   - Text format: Human-readable output (default)
   - JSON format: Structured data with status, data, and error fields
@@ -43,411 +51,140 @@ Outputs:
 
 When no --server and no --sql is specified, the script checks ALL configured servers
 and reports their status, databases, tables, and row counts.
+
+Row counts are read from information_schema in one query per database. For
+InnoDB tables these are estimates, shown as "~1234" (JSON/YAML: "estimated": true);
+use --exact-counts to run a COUNT(*) per table instead.
 """
 
-import os
 import sys
-import json
 import argparse
 from pathlib import Path
-from dotenv import load_dotenv
 import pymysql
-import yaml
-from typing import Dict, List, Optional, Any, Tuple
-
-
-def load_environment() -> None:
-    """Load environment variables from .env file."""
-    env_path = Path(__file__).parent.parent / '.env'
-    if not env_path.exists():
-        return
-    load_dotenv(env_path)
-
-
-def load_database_config() -> Dict:
-    """Load database configuration from config/database.yaml."""
-    config_path = Path(__file__).parent.parent / 'config' / 'database.yaml'
-    if not config_path.exists():
-        error_exit(f"Configuration file not found at {config_path}", json_output=False)
-    
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
-
-
-def get_all_connection_names() -> List[str]:
-    """Get list of all configured MySQL connection names."""
-    db_config = load_database_config()
-    connections = db_config.get('mysql_connections', {})
-    return list(connections.keys())
-
-
-def is_config_complete(config: Dict[str, Any]) -> Tuple[bool, List[str]]:
-    """
-    Check if all required configuration values are non-empty.
-    
-    Returns:
-        Tuple of (is_complete, missing_vars)
+from pymysql.constants import SERVER_STATUS
+from typing import Dict, List, Optional, Any
+
+from _daemon import connect_daemon, default_socket_path, run_captured, send_request, serve_forever
+# Shared helpers are re-exported here, so existing `from manage_db import ...`
+# callers keep working
+from _db_common import (
+    error_exit,
+    execute_sql,
+    execute_sql_stream,
+    get_all_connection_names,
+    get_all_table_row_estimates,
+    get_all_table_update_times,
+    get_all_tables,
+    get_connection,
+    get_connection_config,
+    get_databases,
+    get_table_row_count,
+    get_table_row_estimates,
+    get_tables,
+    is_config_complete,
+    load_database_config,
+    load_environment,
+    quote_identifier,
+    sanitize_sql
+)
+from _db_overview import get_all_servers_overview, get_database_overview
+from _db_output import (
+    format_overview_text,
+    format_all_servers_text,
+    format_sql_results_text,
+    write_overview_text,
+    write_all_servers_text,
+    output_json,
+    output_yaml,
+    write_sql_results_text,
+    write_sql_results_json,
+    write_sql_results_yaml
+)
+
+
+# Set by --daemon: --sql requests borrow connections from the per-server
+# pools in _pool instead of opening and closing one per request
+_use_connection_pool = False
+
+
+def acquire_connection(config: Dict[str, Any], database: Optional[str] = None) -> pymysql.connections.Connection:
     """
-    required_fields = ['host', 'port', 'user', 'password']
-    missing = []
-    
-    for field in required_fields:
-        value = config.get(field)
-        # Check if value is None, empty string, or 0 (but 0 port is invalid anyway)
-        if value is None or (isinstance(value, str) and value.strip() == ''):
-            missing.append(field)
-    
-    return len(missing) == 0, missing
-
-
-def get_connection_config(connection_name: str) -> Dict[str, Any]:
-    """Get MySQL connection configuration for specified connection."""
-    db_config = load_database_config()
-    
-    # Get connection settings
-    connections = db_config.get('mysql_connections', {})
-    if connection_name not in connections:
-        available = ', '.join(connections.keys())
-        error_exit(
-            f"Connection '{connection_name}' not found. Available: {available}",
-            json_output=False
-        )
-    
-    conn_settings = connections[connection_name]
-    env_prefix = conn_settings['env_prefix']
-    
-    # Build config from environment variables
-    config = {
-        'name': connection_name,
-        'host': os.getenv(f'{env_prefix}_HOST', ''),
-        'port': int(os.getenv(f'{env_prefix}_PORT', '3306')) if os.getenv(f'{env_prefix}_PORT', '').strip() else 0,
-        'user': os.getenv(f'{env_prefix}_USER', ''),
-        'password': os.getenv(f'{env_prefix}_PASSWORD', ''),
-        'connection_timeout': conn_settings.get('connection_timeout', 5),
-        'read_timeout': conn_settings.get('read_timeout', 30),
-        'write_timeout': conn_settings.get('write_timeout', 30),
-        'charset': conn_settings.get('charset', 'utf8mb4'),
-    }
-    
-    return config
+    Get a connection for one --sql request; pair with release_connection().
 
-
-def get_connection(config: Dict[str, Any], raise_on_error: bool = True, database: Optional[str] = None) -> Optional[pymysql.connections.Connection]:
-    """
-    Create and return a MySQL connection.
-
-    Args:
-        config: Connection configuration
-        raise_on_error: If False, return None on connection failure instead of raising
-        database: Optional database name to auto-select upon connection
-
-    Returns:
-        Connection object or None if connection failed and raise_on_error=False
+    Opens a new connection, or in daemon mode borrows one from the pool.
     """
-    try:
-        connect_args = {
-            'host': config['host'],
-            'port': config['port'],
-            'user': config['user'],
-            'password': config['password'],
-            'connect_timeout': config['connection_timeout'],
-            'read_timeout': config['read_timeout'],
-            'write_timeout': config['write_timeout'],
-            'charset': config['charset']
-        }
-
-        # Add database parameter if provided
-        if database:
-            connect_args['database'] = database
-
-        connection = pymysql.connect(**connect_args)
-        return connection
-    except pymysql.Error as e:
-        if raise_on_error:
-            error_exit(f"Connection failed: {e}")
-        return None
-
-
-def sanitize_sql(sql: str) -> str:
-    """
-    Sanitize SQL query to fix common shell escaping issues.
-
-    Specifically handles:
-    - Escaped != operator (\\!= -> !=) caused by shell history expansion
-
-    Args:
-        sql: Raw SQL query string
+    if not _use_connection_pool:
+        return get_connection(config, database=database)
 
-    Returns:
-        Sanitized SQL query string
-    """
-    # Fix escaped != operator from shell
-    return sql.replace('\\!=', '!=')
+    from _pool import get_pooled_connection
+    return get_pooled_connection(config, database=database).get_conn()
 
 
-def execute_sql(connection: pymysql.connections.Connection, sql: str) -> Tuple[List[Tuple], List[str]]:
+def release_connection(connection: pymysql.connections.Connection, config: Dict[str, Any],
+                       database: Optional[str] = None) -> None:
     """
-    Execute SQL query and return results with column names.
+    Close a connection from acquire_connection(), or return it to its pool.
 
-    Returns:
-        Tuple of (rows, column_names)
+    Connections run in autocommit mode, so there is normally nothing to
+    clean up. A request that opened a transaction itself (START TRANSACTION)
+    is rolled back before the connection goes back to the pool, like
+    closing the connection would have done.
     """
-    # Sanitize SQL to fix shell escaping issues
-    sql = sanitize_sql(sql)
-
-    with connection.cursor() as cursor:
-        cursor.execute(sql)
-        
-        # Get column names if available
-        column_names = []
-        if cursor.description:
-            column_names = [desc[0] for desc in cursor.description]
-        
-        # Fetch all results
-        rows = cursor.fetchall()
-        
-        # Commit for write operations
-        if sql.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE', 'CREATE', 'DROP', 'ALTER')):
-            connection.commit()
-        
-        return rows, column_names
-
-
-def get_databases(connection: pymysql.connections.Connection) -> List[str]:
-    """Get list of all databases."""
-    rows, _ = execute_sql(connection, "SHOW DATABASES")
-    return [row[0] for row in rows]
-
-
-def get_tables(connection: pymysql.connections.Connection, database: str) -> List[str]:
-    """Get list of tables in a specific database."""
-    rows, _ = execute_sql(connection, f"SHOW TABLES FROM `{database}`")
-    return [row[0] for row in rows]
-
-
-def get_table_row_count(connection: pymysql.connections.Connection, database: str, table: str) -> int:
-    """Get row count for a specific table."""
-    rows, _ = execute_sql(connection, f"SELECT COUNT(*) FROM `{database}`.`{table}`")
-    return rows[0][0]
-
+    if not _use_connection_pool:
+        connection.close()
+        return
 
-def get_database_overview(connection: pymysql.connections.Connection, server_name: str) -> Dict[str, Any]:
-    """
-    Get overview of all databases and their tables.
-    
-    Returns structured data suitable for JSON or text output.
-    """
-    system_dbs = {'information_schema', 'mysql', 'performance_schema', 'sys'}
-    
-    databases = get_databases(connection)
-    user_databases = [db for db in databases if db not in system_dbs]
-    
-    overview = {
-        'server': server_name,
-        'status': 'ok',
-        'total_databases': len(databases),
-        'user_databases': [],
-        'system_databases': []
-    }
-    
-    # Process user databases
-    for db in user_databases:
-        db_info = {
-            'name': db,
-            'tables': []
-        }
-        
-        tables = get_tables(connection, db)
-        for table in tables:
+    from _pool import get_pooled_connection
+    if connection.open and connection.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+        try:
+            connection.rollback()
+        except pymysql.Error:
+            # Broken connection: make sure it is closed so release() drops it
             try:
-                count = get_table_row_count(connection, db, table)
-                db_info['tables'].append({
-                    'name': table,
-                    'row_count': count
-                })
-            except pymysql.Error as e:
-                db_info['tables'].append({
-                    'name': table,
-                    'row_count': None,
-                    'error': str(e)
-                })
-        
-        overview['user_databases'].append(db_info)
-    
-    # Process system databases (just count tables)
-    for db in sorted(system_dbs & set(databases)):
-        tables = get_tables(connection, db)
-        overview['system_databases'].append({
-            'name': db,
-            'table_count': len(tables)
-        })
-    
-    return overview
+                connection.close()
+            except pymysql.Error:
+                pass
+    get_pooled_connection(config, database=database).release(connection)
 
 
-def get_all_servers_overview() -> List[Dict[str, Any]]:
+def serve_daemon(socket_path: Path) -> None:
     """
-    Get overview of ALL configured servers.
-    
-    Returns list of server overviews, including unreachable servers and those with missing config.
-    """
-    connection_names = get_all_connection_names()
-    all_overviews = []
-    
-    for conn_name in connection_names:
-        try:
-            config = get_connection_config(conn_name)
-            
-            # Check if config is complete
-            is_complete, missing_vars = is_config_complete(config)
-            
-            if not is_complete:
-                # Config is missing required values
-                all_overviews.append({
-                    'server': conn_name,
-                    'status': 'config missing',
-                    'missing_vars': missing_vars
-                })
-                continue
-            
-            # Try to connect
-            connection = get_connection(config, raise_on_error=False)
-            
-            if connection is None:
-                # Server not reachable
-                all_overviews.append({
-                    'server': conn_name,
-                    'status': 'not reachable',
-                    'host': config['host'],
-                    'port': config['port']
-                })
-            else:
-                # Server reachable - get full overview
-                try:
-                    overview = get_database_overview(connection, conn_name)
-                    all_overviews.append(overview)
-                finally:
-                    connection.close()
-        
-        except Exception as e:
-            all_overviews.append({
-                'server': conn_name,
-                'status': 'error',
-                'error': str(e)
-            })
-    
-    return all_overviews
+    Run manage_db invocations received on a Unix socket (--daemon mode).
 
+    The process stays resident with its imports and config loaded, and --sql
+    requests borrow connections from per-server pools, so a --client call
+    skips interpreter startup and the MySQL handshake.
+    """
+    global _use_connection_pool
+    _use_connection_pool = True
 
-def format_overview_text(overview: Dict[str, Any]) -> str:
-    """Format database overview as human-readable text."""
-    lines = []
-    
-    # Handle config missing
-    if overview.get('status') == 'config missing':
-        missing_str = ', '.join(overview.get('missing_vars', []))
-        lines.append(f"server: {overview['server']}, db: -, status: config incomplete ({missing_str} missing)")
-        lines.append("")  # Empty line
-        return "\n".join(lines)
-    
-    # Handle not reachable
-    if overview.get('status') == 'not reachable':
-        lines.append(f"server: {overview['server']}, db: -, status: not reachable")
-        if 'host' in overview and 'port' in overview:
-            lines.append(f"  target: {overview['host']}:{overview['port']}")
-        return "\n".join(lines)
-    
-    # Handle error
-    if overview.get('status') == 'error':
-        lines.append(f"server: {overview['server']}, db: -, status: error")
-        if 'error' in overview:
-            lines.append(f"  error: {overview['error']}")
-        return "\n".join(lines)
-    
-    # Handle connected servers (status: ok)
-    for db_info in overview.get('user_databases', []):
-        lines.append(f"server: {overview['server']}, db: {db_info['name']}, status: ok")
-        
-        if not db_info['tables']:
-            lines.append("  (no tables)")
-        else:
-            for table in db_info['tables']:
-                if table.get('error'):
-                    lines.append(f"  {table['name']}: ERROR - {table['error']}")
-                else:
-                    lines.append(f"  {table['name']}: {table['row_count']}")
-        lines.append("")  # Empty line between databases
-    
-    # If no user databases, show minimal info
-    if not overview.get('user_databases'):
-        lines.append(f"server: {overview['server']}, db: -, status: ok")
-        lines.append("  (no user databases)")
-        lines.append("")
-    
-    return "\n".join(lines)
-
+    from _pool import get_pooled_connection
 
-def format_all_servers_text(all_overviews: List[Dict[str, Any]]) -> str:
-    """Format all server overviews as human-readable text."""
-    lines = []
-    
-    for overview in all_overviews:
-        lines.append(format_overview_text(overview))
-    
-    return "\n".join(lines).rstrip()
+    # Open the first pooled connection to every fully configured server
+    load_environment()
+    db_config = load_database_config()
+    for name in get_all_connection_names(db_config):
+        config = get_connection_config(name, db_config)
+        if not is_config_complete(config)[0]:
+            continue
+        try:
+            get_pooled_connection(config)
+        except SystemExit:
+            print(f"Warning: {name} not reachable, requests for it will report errors", file=sys.stderr)
 
+    def handle(request):
+        return run_captured(main, request.get('argv', []))
 
-def format_sql_results_text(rows: List[Tuple], column_names: List[str]) -> str:
-    """Format SQL query results as human-readable text."""
-    if not rows:
-        return "(no results)"
-    
-    lines = []
-    
-    # Add column headers if available
-    if column_names:
-        lines.append(" | ".join(column_names))
-        lines.append("-" * 80)
-    
-    # Add rows
-    for row in rows:
-        lines.append(" | ".join(str(val) for val in row))
-    
-    return "\n".join(lines)
-
-
-def output_json(status: str, data: Any = None, error: str = None) -> None:
-    """Output JSON response."""
-    response = {
-        'status': status,
-        'data': data,
-        'error': error
-    }
-    print(json.dumps(response, indent=2, default=str))
-
-
-def output_yaml(status: str, data: Any = None, error: str = None) -> None:
-    """Output YAML response."""
-    response = {
-        'status': status,
-        'data': data,
-        'error': error
-    }
-    print(yaml.dump(response, default_flow_style=False, sort_keys=False, allow_unicode=True))
-
-
-def error_exit(message: str, json_output: bool = False, yaml_output: bool = False) -> None:
-    """Exit with error message."""
-    if json_output:
-        output_json('error', error=message)
-    elif yaml_output:
-        output_yaml('error', error=message)
-    else:
-        print(f"Error: {message}", file=sys.stderr)
-    sys.exit(1)
+    print(f"manage_db daemon listening on {socket_path}", file=sys.stderr)
+    try:
+        serve_forever(socket_path, handle)
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        error_exit(str(e))
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main execution function."""
     parser = argparse.ArgumentParser(
         description='MySQL Database Management Tool',
@@ -473,6 +210,20 @@ def main():
         help='SQL query to execute'
     )
     
+    parser.add_argument(
+        '--exact-counts',
+        action='store_true',
+        help='Count rows with COUNT(*) per table instead of using the (estimated for InnoDB) '
+             'counts from information_schema'
+    )
+
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='With --sql: stream rows from a server-side cursor instead of loading the '
+             'whole result into memory (for very large result sets)'
+    )
+
     # Create mutually exclusive group for output formats
     output_group = parser.add_mutually_exclusive_group()
 
@@ -488,7 +239,52 @@ def main():
         help='Output results in YAML format'
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Stay resident on a Unix socket and run --client requests with pooled connections'
+    )
+
+    parser.add_argument(
+        '--client',
+        action='store_true',
+        help='Send this invocation to a running --daemon (runs locally if none is listening)'
+    )
+
+    parser.add_argument(
+        '--socket',
+        type=str,
+        help='Unix socket path for --daemon/--client (default: per-user runtime directory)'
+    )
+
+    if argv is None:
+        argv = sys.argv[1:]
+    args = parser.parse_args(argv)
+
+    if args.daemon or args.client:
+        if _use_connection_pool:
+            error_exit("--daemon/--client cannot be used in a request to the daemon", args.json, args.yaml)
+
+        socket_path = Path(args.socket) if args.socket else default_socket_path('manage_db')
+        if args.daemon:
+            serve_daemon(socket_path)
+            return
+
+        try:
+            client = connect_daemon(socket_path)
+        except OSError:
+            pass  # No daemon listening: run the command in this process instead
+        else:
+            # Once the request is sent the daemon may have run it, so a
+            # failure is reported instead of running the query a second time
+            try:
+                response = send_request(client, {'argv': [arg for arg in argv if arg != '--client']})
+            except (OSError, ValueError) as e:
+                error_exit(f"Lost connection to the manage_db daemon ({e}); "
+                           "the query may or may not have run", args.json, args.yaml)
+            sys.stdout.write(response['stdout'])
+            sys.stderr.write(response['stderr'])
+            sys.exit(response['exit_code'])
     
     # Load environment
     load_environment()
@@ -500,7 +296,7 @@ def main():
         server_name = args.server or db_config.get('default_connection', 'vosscloud')
         
         try:
-            config = get_connection_config(server_name)
+            config = get_connection_config(server_name, db_config)
         except Exception as e:
             error_exit(str(e), args.json, args.yaml)
 
@@ -515,41 +311,45 @@ def main():
         
         # Connect to database (with optional database auto-selection)
         try:
-            connection = get_connection(config, database=args.database)
+            connection = acquire_connection(config, database=args.database)
         except Exception as e:
             error_exit(str(e), args.json, args.yaml)
 
         try:
-            # Execute provided SQL query
-            rows, column_names = execute_sql(connection, args.sql)
-
-            if args.json:
-                # Convert rows to list of dicts if column names available
-                if column_names:
-                    data = [dict(zip(column_names, row)) for row in rows]
-                else:
-                    data = [list(row) for row in rows]
-
-                output_json(
-                    'success',
-                    data={
-                        'server': config['name'],
-                        'rows': data,
-                        'row_count': len(rows)
-                    }
-                )
-            elif args.yaml:
-                # Convert rows to list of dicts if column names available
-                if column_names:
-                    data = [dict(zip(column_names, row)) for row in rows]
+            if args.stream:
+                # Stream rows straight to stdout instead of buffering them
+                rows, column_names = execute_sql_stream(connection, args.sql)
+
+                if args.json:
+                    write_sql_results_json(config['name'], rows, column_names)
+                elif args.yaml:
+                    write_sql_results_yaml(config['name'], rows, column_names)
                 else:
-                    data = [list(row) for row in rows]
-
-                output_yaml(
+                    print(f"Server: {config['name']}")
+                    print(f"Query: {args.sql}")
+                    print("-" * 80)
+                    row_count = write_sql_results_text(rows, column_names)
+                    print(f"\n({row_count} row(s) returned)")
+                return
+
+            # Execute provided SQL query. For JSON/YAML the driver returns
+            # rows as dicts, so no second, converted copy of the result is built
+            if args.json or args.yaml:
+                with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                    rows, column_names = execute_sql(connection, args.sql, cursor)
+            else:
+                rows, column_names = execute_sql(connection, args.sql)
+
+            if args.json or args.yaml:
+                # DictCursor.fetchall() returns the cursor's own list of rows,
+                # which is passed on as is. Only an empty result comes back as
+                # an empty tuple, which the YAML dumper would tag as a tuple
+                output = output_json if args.json else output_yaml
+                output(
                     'success',
                     data={
                         'server': config['name'],
-                        'rows': data,
+                        'rows': rows or [],
                         'row_count': len(rows)
                     }
                 )
@@ -565,7 +365,7 @@ def main():
         except Exception as e:
             error_exit(f"Unexpected error: {e}", args.json, args.yaml)
         finally:
-            connection.close()
+            release_connection(connection, config, database=args.database)
     
     elif args.server:
         # Single server overview mode
@@ -596,7 +396,7 @@ def main():
                     }
                 else:
                     try:
-                        overview = get_database_overview(connection, config['name'])
+                        overview = get_database_overview(connection, config['name'], args.exact_counts, config)
                     finally:
                         connection.close()
 
@@ -605,7 +405,7 @@ def main():
             elif args.yaml:
                 output_yaml('success', data=overview)
             else:
-                print(format_overview_text(overview))
+                write_overview_text(overview)
 
         except Exception as e:
             error_exit(f"Unexpected error: {e}", args.json, args.yaml)
@@ -613,14 +413,14 @@ def main():
     else:
         # Multi-server overview mode (default - check ALL servers)
         try:
-            all_overviews = get_all_servers_overview()
+            all_overviews = get_all_servers_overview(args.exact_counts)
 
             if args.json:
                 output_json('success', data={'servers': all_overviews})
             elif args.yaml:
                 output_yaml('success', data={'servers': all_overviews})
             else:
-                print(format_all_servers_text(all_overviews))
+                write_all_servers_text(all_overviews)
 
         except Exception as e:
             error_exit(f"Unexpected error: {e}", args.json, args.yaml)
@@ -14,112 +14,84 @@ Connects to a MySQL server and provides detailed status information including:
 - List of databases
 - Tables in each database
 - Row counts for each table
+
+Row counts are read from information_schema in one query; for InnoDB tables
+they are estimates (shown as "~1234"). Use --exact-counts for COUNT(*); the
+counts then run on --workers parallel connections (default 8).
+
+Exact counts are saved to ~/.cache/indomonitor/status_counts.json with each
+table's information_schema UPDATE_TIME. The next --exact-counts run reuses
+the count of every table whose UPDATE_TIME is unchanged instead of counting
+it again (tables without an UPDATE_TIME, e.g. InnoDB on MariaDB, are always
+counted). --refresh counts every table.
+
+Usage:
+  ./scripts/status_check.py [connection_name] [--exact-counts [--refresh]] [--workers N]
 """
 
-import os
+import argparse
+import json
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import Any, Dict
+
 import pymysql
-import yaml
-from typing import Dict, List, Optional
 
+from _db_common import (
+    get_connection,
+    get_connection_config,
+    is_config_complete,
+    load_database_config,
+    load_environment
+)
+from _db_overview import COUNT_WORKERS, get_database_overview
 
-def load_environment() -> None:
-    """Load environment variables from .env file."""
-    env_path = Path(__file__).parent.parent / '.env'
-    load_dotenv(env_path)
+# Exact counts of previous --exact-counts runs, per server
+SNAPSHOT_PATH = Path("~/.cache/indomonitor/status_counts.json").expanduser()
 
 
-def load_database_config() -> Dict:
-    """Load database configuration from config/database.yaml."""
-    config_path = Path(__file__).parent.parent / 'config' / 'database.yaml'
-    if not config_path.exists():
-        print(f"Error: Configuration file not found at {config_path}")
-        sys.exit(1)
-    
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+def _snapshot_key(config: Dict[str, Any]) -> str:
+    """Key a server's snapshot by name and address, so a repointed name starts fresh."""
+    return f"{config['name']}@{config['host']}:{config['port']}"
 
 
-def get_connection_config(connection_name: Optional[str] = None) -> Dict[str, str]:
-    """Get MySQL connection configuration for specified or default connection."""
-    db_config = load_database_config()
-    
-    # Use provided connection name or default
-    if connection_name is None:
-        connection_name = db_config.get('default_connection', 'vosscloud')
-    
-    # Get connection settings
-    connections = db_config.get('mysql_connections', {})
-    if connection_name not in connections:
-        print(f"Error: Connection '{connection_name}' not found in config/database.yaml")
-        print(f"Available connections: {', '.join(connections.keys())}")
-        sys.exit(1)
-    
-    conn_settings = connections[connection_name]
-    env_prefix = conn_settings['env_prefix']
-    
-    # Build config from environment variables
-    config = {
-        'name': connection_name,
-        'host': os.getenv(f'{env_prefix}_HOST', 'localhost'),
-        'port': int(os.getenv(f'{env_prefix}_PORT', '3306')),
-        'user': os.getenv(f'{env_prefix}_USER', 'root'),
-        'password': os.getenv(f'{env_prefix}_PASSWORD', ''),
-        'connection_timeout': conn_settings.get('connection_timeout', 5),
-        'read_timeout': conn_settings.get('read_timeout', 30),
-        'write_timeout': conn_settings.get('write_timeout', 30),
-        'charset': conn_settings.get('charset', 'utf8mb4'),
-    }
-    
-    return config
-
-
-def test_connection(config: Dict[str, str]) -> pymysql.connections.Connection:
-    """Test MySQL connection and return connection object."""
+def load_snapshot(config: Dict[str, Any]) -> Dict[str, Dict[str, list]]:
+    """Get the saved counts of a server ({database: {table: [update_time, rows]}})."""
     try:
-        print(f"Connecting to MySQL server at {config['host']}:{config['port']}...")
-        print(f"Using connection: {config['name']}")
-        connection = pymysql.connect(
-            host=config['host'],
-            port=config['port'],
-            user=config['user'],
-            password=config['password'],
-            connect_timeout=config['connection_timeout'],
-            read_timeout=config['read_timeout'],
-            write_timeout=config['write_timeout'],
-            charset=config['charset']
-        )
-        print("✓ Connection successful!")
-        return connection
-    except pymysql.Error as e:
-        print(f"✗ Connection failed: {e}")
-        sys.exit(1)
-
-
-def get_databases(connection: pymysql.connections.Connection) -> List[str]:
-    """Get list of all databases."""
-    with connection.cursor() as cursor:
-        cursor.execute("SHOW DATABASES")
-        databases = [row[0] for row in cursor.fetchall()]
-    return databases
+        with open(SNAPSHOT_PATH, 'rb') as f:
+            return json.load(f).get(_snapshot_key(config), {})
+    except (OSError, ValueError, AttributeError):
+        return {}  # Missing or corrupt snapshot: count everything
 
 
-def get_tables(connection: pymysql.connections.Connection, database: str) -> List[str]:
-    """Get list of tables in a specific database."""
-    with connection.cursor() as cursor:
-        cursor.execute(f"SHOW TABLES FROM `{database}`")
-        tables = [row[0] for row in cursor.fetchall()]
-    return tables
+def save_snapshot(config: Dict[str, Any], snapshot: Dict[str, Dict[str, list]]) -> None:
+    """Store a server's counts, keeping those of other servers."""
+    try:
+        with open(SNAPSHOT_PATH, 'rb') as f:
+            snapshots = json.load(f)
+        if not isinstance(snapshots, dict):
+            snapshots = {}
+    except (OSError, ValueError):
+        snapshots = {}
+    snapshots[_snapshot_key(config)] = snapshot
+
+    # Written to a temp file first so a concurrent run never reads a partial file
+    tmp_path = SNAPSHOT_PATH.with_name(SNAPSHOT_PATH.name + '.tmp')
+    try:
+        SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(snapshots), encoding='utf-8')
+        tmp_path.replace(SNAPSHOT_PATH)
+    except OSError:
+        pass  # Not writable: the next run just counts again
 
 
-def get_table_row_count(connection: pymysql.connections.Connection, database: str, table: str) -> int:
-    """Get row count for a specific table."""
-    with connection.cursor() as cursor:
-        cursor.execute(f"SELECT COUNT(*) FROM `{database}`.`{table}`")
-        count = cursor.fetchone()[0]
-    return count
+def test_connection(config: Dict[str, Any]) -> pymysql.connections.Connection:
+    """Test MySQL connection and return connection object."""
+    print(f"Connecting to MySQL server at {config['host']}:{config['port']}...")
+    print(f"Using connection: {config['name']}")
+    connection = get_connection(config)  # Exits with the error message on failure
+    print("✓ Connection successful!")
+    return connection
 
 
 def display_server_info(connection: pymysql.connections.Connection) -> None:
@@ -140,10 +112,29 @@ def main():
     load_environment()
 
     # Parse command line arguments
-    connection_name = sys.argv[1] if len(sys.argv) > 1 else None
+    parser = argparse.ArgumentParser(description='MySQL Server Status Checker')
+    parser.add_argument('connection_name', nargs='?',
+                        help='Connection name from config/database.yaml (default: default_connection)')
+    parser.add_argument('--exact-counts', action='store_true',
+                        help='Count rows with COUNT(*) per table instead of information_schema estimates')
+    parser.add_argument('--refresh', action='store_true',
+                        help='With --exact-counts: count every table instead of reusing counts '
+                             'of tables unchanged since the last run')
+    parser.add_argument('--workers', type=int, default=COUNT_WORKERS,
+                        help=f'Parallel connections for COUNT(*) queries (default: {COUNT_WORKERS})')
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    db_config = load_database_config()
+    connection_name = args.connection_name or db_config.get('default_connection', 'vosscloud')
 
     # Get connection configuration
-    config = get_connection_config(connection_name)
+    config = get_connection_config(connection_name, db_config)
+    is_complete, missing_vars = is_config_complete(config)
+    if not is_complete:
+        print(f"Error: Configuration incomplete for {connection_name}. Missing: {', '.join(missing_vars)}")
+        sys.exit(1)
 
     # Test connection
     connection = test_connection(config)
@@ -152,37 +143,39 @@ def main():
         # Display server info
         display_server_info(connection)
 
-        # Get and display databases
-        databases = get_databases(connection)
-        print(f"\nFound {len(databases)} database(s):")
-
-        # Filter out system databases for cleaner output (optional)
-        system_dbs = {'information_schema', 'mysql', 'performance_schema', 'sys'}
-        user_databases = [db for db in databases if db not in system_dbs]
-
-        if user_databases:
+        # Databases, tables and row counts (InnoDB counts are estimates, "~",
+        # unless --exact-counts)
+        snapshot = None
+        if args.exact_counts:
+            snapshot = {} if args.refresh else load_snapshot(config)
+        overview = get_database_overview(connection, config['name'], args.exact_counts, config,
+                                         args.workers, snapshot)
+        if snapshot is not None:
+            save_snapshot(config, snapshot)
+        print(f"\nFound {overview['total_databases']} database(s):")
+
+        if overview['user_databases']:
             print("\nUser Databases:")
-            for db in user_databases:
-                print(f"\n  Database: {db}")
+            for db_info in overview['user_databases']:
+                print(f"\n  Database: {db_info['name']}")
                 print("  " + "-" * 50)
 
-                tables = get_tables(connection, db)
+                tables = db_info['tables']
                 if tables:
                     print(f"  Tables: {len(tables)}")
                     for table in tables:
-                        try:
-                            count = get_table_row_count(connection, db, table)
-                            print(f"    - {table}: {count:,} rows")
-                        except pymysql.Error as e:
-                            print(f"    - {table}: Error reading ({e})")
+                        if table.get('error'):
+                            print(f"    - {table['name']}: Error reading ({table['error']})")
+                        else:
+                            prefix = "~" if table.get('estimated') else ""
+                            print(f"    - {table['name']}: {prefix}{table['row_count']:,} rows")
                 else:
                     print("  No tables found")
 
-        if system_dbs & set(databases):
+        if overview['system_databases']:
             print("\n\nSystem Databases:")
-            for db in sorted(system_dbs & set(databases)):
-                tables = get_tables(connection, db)
-                print(f"  - {db}: {len(tables)} tables")
+            for db_info in overview['system_databases']:
+                print(f"  - {db_info['name']}: {db_info['table_count']} tables")
 
         print("\n" + "=" * 60)
         print("Status check complete!")
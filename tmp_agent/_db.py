@@ -0,0 +1,114 @@
+"""
+Shared vosscloud connection for the tmp_agent schema scripts.
+
+The scripts used to each read the config and open their own connection.
+get_conn() opens the connection on first use and keeps it in this module's
+globals. Running several schema steps in one process then pays for the TCP
+handshake and MySQL authentication only once. The connection is pinged
+before it is handed out again, and closed when the process exits.
+
+pymysql and python-dotenv are imported on first use, so scripts that fail
+before connecting do not pay for loading them.
+
+Usage:
+  from _db import get_conn
+
+  connection = get_conn()
+  with connection.cursor() as cursor:
+      ...
+"""
+
+import atexit
+import os
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Mapping
+
+from _yaml_cache import load_yaml
+
+if TYPE_CHECKING:
+    import pymysql
+
+# Resolved once, so paths (and the YAML cache key) do not depend on the cwd
+_ROOT = Path(__file__).resolve().parent.parent
+ENV_PATH = _ROOT / '.env'
+CONFIG_PATH = _ROOT / 'config' / 'database.yaml'
+SCHEMA_PATH = _ROOT / 'database' / 'generated' / 'sql' / 'schema.sql'
+
+# Open connections keyed by client_flag, reused for the rest of the process
+_connections: Dict[int, "pymysql.connections.Connection"] = {}
+
+
+@lru_cache(maxsize=1)
+def load_environment() -> None:
+    """Load environment variables from .env file (once per process)."""
+    if ENV_PATH.exists():
+        from dotenv import load_dotenv
+        load_dotenv(ENV_PATH)
+
+
+@lru_cache(maxsize=1)
+def get_connection_config() -> Mapping[str, Any]:
+    """
+    Get vosscloud connection configuration.
+
+    Built once per process; the result is read-only because every caller
+    shares it, and can be passed straight to pymysql.connect(**config).
+    """
+    load_environment()
+    db_config = load_yaml(CONFIG_PATH)
+
+    conn_settings = db_config['mysql_connections']['vosscloud']
+    env_prefix = conn_settings['env_prefix']
+
+    return MappingProxyType({
+        'host': os.getenv(f'{env_prefix}_HOST'),
+        'port': int(os.getenv(f'{env_prefix}_PORT', '3306')),
+        'user': os.getenv(f'{env_prefix}_USER'),
+        'password': os.getenv(f'{env_prefix}_PASSWORD'),
+        'database': 'indomonitor',
+        'charset': 'utf8mb4',
+    })
+
+
+def get_conn(client_flag: int = 0) -> "pymysql.connections.Connection":
+    """
+    Get the process-wide vosscloud connection, opening it on first use.
+
+    Callers must not close the connection; it is shared and closed at exit.
+
+    Args:
+        client_flag: Extra pymysql client flags, e.g. CLIENT.MULTI_STATEMENTS;
+            each distinct value gets its own connection
+
+    Returns:
+        An open pymysql connection to the indomonitor database
+    """
+    connection = _connections.get(client_flag)
+    if connection is not None:
+        # Reconnects in place if the server closed the idle connection
+        connection.ping(reconnect=True)
+        return connection
+
+    import pymysql
+    connection = pymysql.connect(**get_connection_config(), client_flag=client_flag)
+    _connections[client_flag] = connection
+    return connection
+
+
+def close_all() -> None:
+    """Close every connection opened by get_conn()."""
+    if not _connections:
+        return
+
+    import pymysql
+    for connection in _connections.values():
+        try:
+            connection.close()
+        except pymysql.Error:
+            pass
+    _connections.clear()
+
+
+atexit.register(close_all)
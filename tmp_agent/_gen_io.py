@@ -0,0 +1,181 @@
+"""
+File and process helpers for generate_schema_models_split.py.
+
+- write_generated_files(): writes generated files, skipping those whose
+  content and on-disk bytes are unchanged since the last run
+- format_with_black(): formats written Python files, for post_write
+- map_api_jobs(): renders per-API files in worker processes for large
+  schema sets
+- load_yaml_file(): loads schema YAML through a pickle cache kept next to
+  each file
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Schema count from which the generators render APIs in parallel (see
+# map_api_jobs()); below it, starting worker processes costs more than it saves
+PARALLEL_MIN_SCHEMAS = 200
+
+# Digests of the files last written to a generated directory, see write_generated_files()
+DIGESTS_FILENAME = ".generated_digests.json"
+
+
+def _content_digest(data, timestamp):
+    """BLAKE2b digest of encoded file content, ignoring the generation timestamp."""
+    return hashlib.blake2b(data.replace(timestamp, b"")).hexdigest()
+
+
+def _file_digest(data):
+    """BLAKE2b digest of a file's bytes as stored on disk."""
+    return hashlib.blake2b(data).hexdigest()
+
+
+def _is_up_to_date(path, content_digest, entry):
+    """
+    Check whether path still holds what was generated for content_digest.
+
+    Both the rendered content and the file on disk must match the recorded
+    entry, so a file that was edited, reverted or never post-processed is
+    written again.
+    """
+    if not isinstance(entry, dict) or entry.get("content") != content_digest:
+        return False
+    try:
+        return _file_digest(path.read_bytes()) == entry.get("file")
+    except OSError:
+        return False
+
+
+def write_generated_files(files, output_dir, timestamp, post_write=None):
+    """
+    Write rendered (path, text) pairs as UTF-8, skipping unchanged files.
+
+    For each file, DIGESTS_FILENAME in output_dir records the digest of its
+    rendered content (without the timestamp) and of the file as left on
+    disk. A file is left alone only if both still match, so its modification
+    time, header and Black formatting survive and downstream caches (mypy,
+    ruff, tsc) stay valid.
+
+    Args:
+        files: (path, text) pairs to write
+        output_dir: Directory holding the files and the digests file
+        timestamp: Generation timestamp embedded in the texts
+        post_write: Optional callable run on the written paths (e.g. Black),
+            returning False on failure. The on-disk digests are taken after
+            it; on failure the written files are not recorded, so the next
+            run writes and processes them again.
+
+    Returns:
+        List of the paths that were written
+    """
+    digests_path = output_dir / DIGESTS_FILENAME
+    try:
+        digests = json.loads(digests_path.read_bytes())
+    except (OSError, ValueError):
+        digests = {}
+
+    # Each text is encoded once; the digests and the write share the bytes
+    timestamp_bytes = timestamp.encode("utf-8")
+    written = []
+    for path, text in files:
+        data = text.encode("utf-8")
+        content_digest = _content_digest(data, timestamp_bytes)
+        if _is_up_to_date(path, content_digest, digests.get(path.name)):
+            continue
+
+        # One binary write of the whole buffer, no text-layer encoding/newline pass
+        path.write_bytes(data)
+        digests[path.name] = {"content": content_digest, "file": _file_digest(data)}
+        written.append(path)
+
+    if written and post_write is not None:
+        if post_write(written):
+            for path in written:
+                digests[path.name]["file"] = _file_digest(path.read_bytes())
+        else:
+            for path in written:
+                del digests[path.name]
+    if written:
+        digests_path.write_bytes(json.dumps(digests, indent=2, sort_keys=True).encode("utf-8") + b"\n")
+
+    print(f"  {len(written)} file(s) written, {len(files) - len(written)} unchanged")
+    return written
+
+
+def format_with_black(paths):
+    """
+    Format Python files with Black.
+
+    Returns:
+        True on success; on failure a warning is printed and False returned
+    """
+    try:
+        # One black process for all files; --fast skips the AST equivalence
+        # check, which guards against Black bugs on hand-written code and is
+        # not needed for generated code
+        subprocess.run(["black", "--fast", *map(str, paths)], check=True, capture_output=True)
+    except (ImportError, OSError, subprocess.SubprocessError) as e:
+        print(f"Warning: Failed to format: {str(e)}")
+        return False
+    print(f"Formatted {len(paths)} Python file(s) with Black")
+    return True
+
+
+def map_api_jobs(build, jobs, schema_count):
+    """
+    Run a per-API build function over jobs, in parallel for large schema sets.
+
+    Worker processes are used when there is more than one API, at least
+    PARALLEL_MIN_SCHEMAS schemas and more than one CPU. Results are
+    returned in job order either way, so the output does not depend on it.
+    """
+    cpu_count = os.cpu_count() or 1
+    if len(jobs) > 1 and schema_count >= PARALLEL_MIN_SCHEMAS and cpu_count > 1:
+        with ProcessPoolExecutor(max_workers=min(len(jobs), cpu_count)) as executor:
+            return list(executor.map(build, jobs))
+    return [build(job) for job in jobs]
+
+
+def load_yaml_file(yaml_path):
+    """
+    Load a YAML file through a pickle cache kept next to it.
+
+    The parsed data is pickled to `<name>.yaml.cache` together with the
+    file's mtime and size; later runs load the pickle while both still match
+    instead of parsing the YAML again. Every call returns a fresh object, so
+    callers may modify it.
+    """
+    st = yaml_path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cache_path = yaml_path.with_name(yaml_path.name + ".cache")
+
+    try:
+        cached_key, data = pickle.loads(cache_path.read_bytes())
+        if cached_key == key:
+            return data
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        pass  # Missing or corrupt cache: parse the YAML
+
+    data = yaml.load(yaml_path.read_bytes(), Loader=YamlLoader)
+
+    # Written to a temp file first so a concurrent run never reads a partial cache
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        tmp_path.write_bytes(pickle.dumps((key, data), protocol=pickle.HIGHEST_PROTOCOL))
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass  # Read-only checkout: work without the cache
+
+    return data
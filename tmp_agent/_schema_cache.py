@@ -0,0 +1,82 @@
+"""
+Cached splitting of schema.sql into individual statements.
+
+The split statement list is pickled next to the schema as
+`schema.sql.cache`, headed by the SHA-256 of the schema it was built from.
+Later runs load the list from the cache while the hash still matches and
+re-split (and rewrite the cache) after the schema is regenerated.
+"""
+
+import hashlib
+import pickle
+import re
+from pathlib import Path
+from typing import List
+
+_HASH_SIZE = hashlib.sha256().digest_size
+_BLOCK_SIZE = 1 << 20
+
+# A newline followed by blank and `--` comment lines
+_SKIPPED_LINES = re.compile(r'\n(?:[ \t\r]*(?:--[^\n]*)?\n)+')
+# ';' at the end of a line
+_STATEMENT_END = re.compile(r';[ \t\r]*(?:\n|\Z)')
+
+
+def split_statements(schema_sql: str) -> List[str]:
+    """
+    Split SQL into statements, skipping empty lines and `--` comment lines.
+
+    A statement ends at a line ending with ';' and keeps its original line
+    breaks and indentation; text after the last ';' is dropped. Both steps
+    are single regex passes over the whole schema.
+    """
+    # The leading newline lets the pattern match skipped lines at the start
+    sql = _SKIPPED_LINES.sub('\n', '\n' + schema_sql)[1:]
+    # The last piece is whatever follows the final statement (usually '')
+    return [statement + ';' for statement in _STATEMENT_END.split(sql)[:-1]]
+
+
+def load_statements(schema_path: Path) -> List[str]:
+    """
+    Get the statements of a schema file, using the pickled cache when valid.
+
+    Args:
+        schema_path: Path to schema.sql
+
+    Returns:
+        List of SQL statements in file order
+    """
+    schema_path = Path(schema_path)
+    cache_path = schema_path.with_name(schema_path.name + '.cache')
+
+    # Hashed in 1 MiB blocks: a cache hit never holds the schema in memory
+    # (a read loop rather than hashlib.file_digest, which needs Python 3.11)
+    sha256 = hashlib.sha256()
+    with open(schema_path, 'rb') as f:
+        while block := f.read(_BLOCK_SIZE):
+            sha256.update(block)
+    digest = sha256.digest()
+
+    try:
+        cached = cache_path.read_bytes()
+        if cached[:_HASH_SIZE] == digest:
+            return pickle.loads(cached[_HASH_SIZE:])
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass  # Missing or corrupt cache: rebuild it
+
+    # One binary read: the cache is keyed by the digest of exactly the bytes
+    # that were split, even if schema.sql is rewritten in the meantime, and
+    # the text is decoded once without the text-mode newline translation
+    source = schema_path.read_bytes()
+    digest = hashlib.sha256(source).digest()
+    statements = split_statements(source.decode('utf-8'))
+
+    # Written to a temp file first so a concurrent run never reads a partial cache
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    try:
+        tmp_path.write_bytes(digest + pickle.dumps(statements, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass  # Read-only checkout: work without the cache
+
+    return statements
@@ -0,0 +1,53 @@
+"""
+Memoized YAML loading for the tmp_agent scripts.
+
+Parsed files are kept per process, keyed by path and validated against the
+file's mtime and size, so repeated loads of an unchanged file skip both the
+read and the parse. Parsing uses libyaml's CSafeLoader when available;
+PyYAML itself is only imported once a file actually has to be parsed.
+
+Callers get the cached object itself and must not mutate it.
+"""
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Tuple, Union
+
+# Most recently used entries last: path -> (st_mtime_ns, st_size, parsed)
+_cache: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+_MAX_ENTRIES = 100
+
+
+def load_yaml(path: Union[str, Path]) -> Any:
+    """
+    Load a YAML file, reusing the parsed result while the file is unchanged.
+
+    Args:
+        path: YAML file to load
+
+    Returns:
+        Parsed YAML document (shared between callers; do not mutate)
+    """
+    key = str(path)
+    st = os.stat(key)
+
+    entry = _cache.get(key)
+    if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        _cache.move_to_end(key)
+        return entry[2]
+
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
+    # One read of the whole file; the bytes go straight to libyaml
+    parsed = yaml.load(Path(key).read_bytes(), Loader=SafeLoader)
+
+    _cache[key] = (st.st_mtime_ns, st.st_size, parsed)
+    _cache.move_to_end(key)
+    if len(_cache) > _MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return parsed
@@ -3,7 +3,7 @@
 # dependencies = [
 #   "pymysql",
 #   "python-dotenv",
-#   "pyyaml",
+#   "pyyaml",  # binary wheels bundle libyaml (CSafeLoader)
 # ]
 # ///
 """
@@ -11,116 +11,95 @@ Execute database schema migration for indomonitor database.
 This script reads the generated schema SQL and executes it on the vosscloud server.
 """
 
-import os
+import re
 import sys
-from pathlib import Path
-from dotenv import load_dotenv
-import pymysql
-import yaml
 
+from _db import SCHEMA_PATH, get_conn, get_connection_config
+from _schema_cache import load_statements
 
-def load_environment():
-    """Load environment variables from .env file."""
-    env_path = Path(__file__).parent.parent / '.env'
-    if env_path.exists():
-        load_dotenv(env_path)
+# Statements sent per multi-statement query
+BATCH_SIZE = 64
 
+# Table name (as written, backticks included) for describe_statement()
+_CREATE_TABLE_RE = re.compile(r'CREATE TABLE\s+(?:IF NOT EXISTS\s+)?([^\s(]+)')
+_ALTER_TABLE_RE = re.compile(r'ALTER TABLE\s+([^\s(]+)')
 
-def get_connection_config():
-    """Get vosscloud connection configuration."""
-    config_path = Path(__file__).parent.parent / 'config' / 'database.yaml'
 
-    with open(config_path, 'r') as f:
-        db_config = yaml.safe_load(f)
-
-    conn_settings = db_config['mysql_connections']['vosscloud']
-    env_prefix = conn_settings['env_prefix']
-
-    return {
-        'host': os.getenv(f'{env_prefix}_HOST'),
-        'port': int(os.getenv(f'{env_prefix}_PORT', '3306')),
-        'user': os.getenv(f'{env_prefix}_USER'),
-        'password': os.getenv(f'{env_prefix}_PASSWORD'),
-        'database': 'indomonitor',
-        'charset': 'utf8mb4',
-    }
+def describe_statement(statement: str) -> str:
+    """Get a progress label for a statement, naming the table it affects."""
+    match = _CREATE_TABLE_RE.search(statement)
+    if match:
+        return f"Creating table: {match.group(1)}"
+    match = _ALTER_TABLE_RE.search(statement)
+    if match:
+        return f"Adding constraints to: {match.group(1)}"
+    return "Executing statement..."
 
 
 def execute_schema():
     """Execute the schema migration."""
-    # Load environment
-    load_environment()
+    import pymysql
+    from pymysql.constants import CLIENT
 
     # Get connection config
     config = get_connection_config()
 
-    # Read schema file
-    schema_path = Path(__file__).parent.parent / 'database' / 'generated' / 'sql' / 'schema.sql'
-    with open(schema_path, 'r') as f:
-        schema_sql = f.read()
+    # Read schema file, split into statements (cached while schema.sql is unchanged)
+    statements = load_statements(SCHEMA_PATH)
 
     # Connect to MySQL
     print(f"Connecting to {config['host']}:{config['port']} as {config['user']}...")
-    connection = pymysql.connect(
-        host=config['host'],
-        port=config['port'],
-        user=config['user'],
-        password=config['password'],
-        database=config['database'],
-        charset=config['charset'],
-    )
-
-    try:
-        with connection.cursor() as cursor:
-            # Split the SQL into individual statements
-            # Remove comments and empty lines
-            statements = []
-            current_statement = []
-
-            for line in schema_sql.split('\n'):
-                # Skip comment lines
-                if line.strip().startswith('--') or not line.strip():
-                    continue
-
-                current_statement.append(line)
-
-                # Check if this line ends a statement (has semicolon)
-                if line.strip().endswith(';'):
-                    stmt = '\n'.join(current_statement)
-                    if stmt.strip():
-                        statements.append(stmt)
-                    current_statement = []
-
-            print(f"\nExecuting {len(statements)} SQL statements...\n")
-
-            # Execute each statement
-            for i, statement in enumerate(statements, 1):
+    connection = get_conn(client_flag=CLIENT.MULTI_STATEMENTS)
+
+    with connection.cursor() as cursor:
+        print(f"\nExecuting {len(statements)} SQL statements...\n")
+
+        # Foreign keys are not checked while the schema is applied: tables may
+        # reference ones created later in the file, and InnoDB can add the
+        # constraints in place instead of copying each table
+        cursor.execute("SET @saved_foreign_key_checks = @@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS = 0")
+        restore_foreign_key_checks = "SET FOREIGN_KEY_CHECKS = @saved_foreign_key_checks"
+        try:
+            # Send statements in groups as one multi-statement query each
+            for start in range(0, len(statements), BATCH_SIZE):
+                batch = statements[start:start + BATCH_SIZE]
+                # Labels of the whole batch go out in one write (one flush
+                # on a terminal) instead of one print per statement
+                sys.stdout.write(''.join(
+                    f"[{i}/{len(statements)}] {describe_statement(statement)}\n"
+                    for i, statement in enumerate(batch, start + 1)
+                ))
+
+                # Results arrive one per statement; count them to know which
+                # statement failed
+                executed = 0
                 try:
-                    # Extract table name for reporting
-                    if 'CREATE TABLE' in statement:
-                        table_name = statement.split('CREATE TABLE')[1].split('(')[0].strip().replace('IF NOT EXISTS', '').strip()
-                        print(f"[{i}/{len(statements)}] Creating table: {table_name}")
-                    elif 'ALTER TABLE' in statement:
-                        table_name = statement.split('ALTER TABLE')[1].split('\n')[0].strip()
-                        print(f"[{i}/{len(statements)}] Adding constraints to: {table_name}")
-                    else:
-                        print(f"[{i}/{len(statements)}] Executing statement...")
-
-                    cursor.execute(statement)
-                    connection.commit()
-                    print(f"    ✓ Success")
+                    cursor.execute('\n'.join(batch).rstrip().rstrip(';'))
+                    executed = 1
+                    while cursor.nextset():
+                        executed += 1
+                    print(f"    ✓ Success ({len(batch)} statements)")
 
                 except Exception as e:
-                    print(f"    ✗ Error: {e}")
-                    print(f"    Statement: {statement[:100]}...")
+                    print(f"    ✗ Error in statement {start + executed + 1}: {e}")
+                    print(f"    Statement: {batch[executed][:100]}...")
                     raise
-
-            print("\n" + "="*80)
-            print("Schema migration completed successfully!")
-            print("="*80)
-
-    finally:
-        connection.close()
+        except Exception:
+            # The connection may be broken by now; a failed restore must not
+            # replace the statement error, which is the one to report
+            try:
+                cursor.execute(restore_foreign_key_checks)
+            except pymysql.Error as e:
+                print(f"    Warning: could not restore FOREIGN_KEY_CHECKS: {e}", file=sys.stderr)
+            raise
+        cursor.execute(restore_foreign_key_checks)
+
+        # DDL commits implicitly; this covers any DML in the schema
+        connection.commit()
+
+        print("\n" + "="*80)
+        print("Schema migration completed successfully!")
+        print("="*80)
 
 
 if __name__ == '__main__':
@@ -12,12 +12,12 @@ Updated for Pydantic 2.4 compatibility.
 
 import argparse
 import sys
-import yaml
 import datetime
 import re
-import subprocess
 from pathlib import Path
-from collections import defaultdict
+from functools import lru_cache
+
+from _gen_io import format_with_black, load_yaml_file, map_api_jobs, write_generated_files
 
 # Type mapping from YAML to Python/TypeScript
 PYTHON_TYPE_MAP = {
@@ -44,17 +44,23 @@ PYTHON_FORMAT_MAP = {
     "date-time": "datetime",
 }
 
+# Patterns for the file name and enum key helpers
+API_SUFFIX_RE = re.compile(r'\s+API$', re.I)
+NON_SNAKE_RE = re.compile(r'[^a-z0-9_]')
+MULTI_UNDERSCORE_RE = re.compile(r'_+')
+NON_KEBAB_RE = re.compile(r'[^a-z0-9-]')
+MULTI_HYPHEN_RE = re.compile(r'-+')
+NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9]')
+
 # CosmosBaseModel template - this will be in its own file
 COSMOSDB_BASE_MODEL = '''# Generated from database_tables.yaml
 # Base model for all database models with Cosmos DB compatibility
 
+from functools import cache
 from typing import Any
 from pydantic import BaseModel, ConfigDict, model_validator
 from datetime import date, datetime
 
-# Module-level cache for storing the inverse field mappings
-_PYTHON_TO_COSMOS_MAPS: dict[str, dict[str, str]] = {}
-
 class CosmosBaseModel(BaseModel):
     """Base model for all schema models with Cosmos DB compatibility features.
 
@@ -140,43 +146,51 @@ class CosmosBaseModel(BaseModel):
         """Get the API name this model belongs to."""
         return cls.__api_name__
 
+    # The mappings below are cached per class with functools.cache, keyed by
+    # the class itself: class structure and model_config are fixed once built
+
+    @classmethod
+    @cache
+    def _get_cosmos_to_python_map(cls):
+        """Get the Cosmos DB to Python field name mapping from model_config (cached).
+
+        Returns:
+            dict: The mapping from Cosmos DB field names to Python property names
+        """
+        return cls.model_config.get("json_schema_extra", {}).get("cosmos_to_python_map", {})
+
     @classmethod
+    @cache
+    def _get_known_attrs(cls) -> frozenset[str]:
+        """Get the names of the fields and attributes of this model (cached).
+
+        This set answers "is this '_' field part of the model?" without a
+        hasattr() MRO walk.
+
+        Returns:
+            frozenset: Model field, private attribute and class attribute names
+        """
+        return frozenset(cls.model_fields).union(cls.__private_attributes__, dir(cls))
+
+    @classmethod
+    @cache
     def _get_python_to_cosmos_map(cls):
-        """Get the Python to Cosmos DB field name mapping, generating it if needed.
+        """Get the Python to Cosmos DB field name mapping, generating it if needed (cached).
 
-        This method checks if the inverse mapping (python_to_cosmos_map) exists:
-        1. First in the module-level cache
-        2. Then in the model_config
-        3. If not found, it generates the inverse of cosmos_to_python_map
+        Uses python_to_cosmos_map from model_config if present, otherwise
+        generates the inverse of cosmos_to_python_map.
 
         Returns:
             dict: The mapping from Python property names to Cosmos DB field names
         """
-        # Check if we've already cached this mapping
-        cls_name = cls.__name__
-        if cls_name in _PYTHON_TO_COSMOS_MAPS:
-            return _PYTHON_TO_COSMOS_MAPS[cls_name]
-
         # Check if mapping already exists in model_config
         python_map = cls.model_config.get("json_schema_extra", {}).get("python_to_cosmos_map")
         if python_map:
-            # Cache it for future use
-            _PYTHON_TO_COSMOS_MAPS[cls_name] = python_map
             return python_map
 
-        # Get the cosmos_to_python_map
-        cosmos_map = cls.model_config.get("json_schema_extra", {}).get("cosmos_to_python_map", {})
-        if not cosmos_map:
-            # No mapping defined, cache an empty dict
-            _PYTHON_TO_COSMOS_MAPS[cls_name] = {}
-            return {}
-
-        # Generate the inverse mapping
-        python_map = {python: cosmos for cosmos, python in cosmos_map.items()}
-
-        # Cache it for future use
-        _PYTHON_TO_COSMOS_MAPS[cls_name] = python_map
-        return python_map
+        # Generate the inverse of the cosmos_to_python_map
+        cosmos_map = cls._get_cosmos_to_python_map()
+        return {python: cosmos for cosmos, python in cosmos_map.items()}
 
     @model_validator(mode='before')
     @classmethod
@@ -185,26 +199,23 @@ class CosmosBaseModel(BaseModel):
         if not isinstance(values, dict):
             return values
 
-        # Create a copy to avoid modifying the input dict during iteration
-        result = values.copy()
-
-        # 1. Filter Cosmos DB system fields
-        cosmos_fields_to_remove = []
-        for key in result:
-            # If field starts with '_' and it's not a model field, mark for removal
-            if key.startswith('_') and not hasattr(cls, key):
-                cosmos_fields_to_remove.append(key)
-
-        # Remove all marked fields
-        for key in cosmos_fields_to_remove:
-            result.pop(key)
-
-        # 2. Apply field name mappings if they exist
-        cosmos_map = cls.model_config.get("json_schema_extra", {}).get("cosmos_to_python_map", {})
+        # Build a new dict (the input dict is left unmodified):
+        # 1. Filter Cosmos DB system fields (starting with '_' and not a model field)
+        # 2. Rename fields using the Cosmos DB -> Python mapping
+        cosmos_map = cls._get_cosmos_to_python_map()
+        known_attrs = cls._get_known_attrs()
+        result = {
+            key: value
+            for key, value in values.items()
+            if key not in cosmos_map and (not key.startswith('_') or key in known_attrs)
+        }
+
+        # Renamed fields are set last, so when the input has both the Cosmos
+        # and the Python name of a field (populate_by_name), the Cosmos value wins
         if cosmos_map:
-            for cosmos_name, python_name in cosmos_map.items():
-                if cosmos_name in result:
-                    result[python_name] = result.pop(cosmos_name)
+            for key, value in values.items():
+                if key in cosmos_map and (not key.startswith('_') or key in known_attrs):
+                    result[cosmos_map[key]] = value
 
         return result
 
@@ -218,14 +229,10 @@ class CosmosBaseModel(BaseModel):
         if not python_map:
             return data
 
-        # Create a new dict with transformed keys
-        result = {}
-        for key, value in data.items():
-            # Use cosmos name if available, otherwise keep the original key
-            cosmos_key = python_map.get(key, key)
-            result[cosmos_key] = value
-
-        return result
+        # Create a new dict with transformed keys, using the cosmos name if
+        # available and the original key otherwise
+        cosmos_name = python_map.get
+        return {cosmos_name(key, key): value for key, value in data.items()}
 '''
 
 # Template for Python API-specific model files
@@ -461,26 +468,26 @@ export * from './cosmos-base';
 def api_name_to_snake_case(api_name):
     """Convert API name to snake_case for file naming."""
     # Remove 'API' suffix if present
-    name = re.sub(r'\s+API$', '', api_name, flags=re.I)
+    name = API_SUFFIX_RE.sub('', api_name)
     # Convert to lowercase and replace spaces with underscores
     name = name.lower().replace(' ', '_')
     # Remove any non-alphanumeric characters except underscores
-    name = re.sub(r'[^a-z0-9_]', '', name)
+    name = NON_SNAKE_RE.sub('', name)
     # Collapse multiple underscores
-    name = re.sub(r'_+', '_', name)
+    name = MULTI_UNDERSCORE_RE.sub('_', name)
     return name.strip('_')
 
 # Helper function to convert API name to kebab-case filename
 def api_name_to_kebab_case(api_name):
     """Convert API name to kebab-case for TypeScript file naming."""
     # Remove 'API' suffix if present
-    name = re.sub(r'\s+API$', '', api_name, flags=re.I)
+    name = API_SUFFIX_RE.sub('', api_name)
     # Convert to lowercase and replace spaces with hyphens
     name = name.lower().replace(' ', '-')
     # Remove any non-alphanumeric characters except hyphens
-    name = re.sub(r'[^a-z0-9-]', '', name)
+    name = NON_KEBAB_RE.sub('', name)
     # Collapse multiple hyphens
-    name = re.sub(r'-+', '-', name)
+    name = MULTI_HYPHEN_RE.sub('-', name)
     return name.strip('-')
 
 # Helper function to convert snake_case to camelCase
@@ -495,30 +502,44 @@ def to_pascal_case(snake_str):
     components = snake_str.split('_')
     return ''.join(x.title() for x in components)
 
+def _items_key(items):
+    """Reduce a field's "items" to the hashable part get_python_type() looks at."""
+    if isinstance(items, dict):
+        return ("dict", items["type"]) if "type" in items else ("dict",)
+    if isinstance(items, str):
+        return ("str", items)
+    return None
+
+def _enum_key(field):
+    """Get a field's enum values as a tuple, or None without an enum."""
+    return tuple(field["enum"]) if "enum" in field else None
+
 def get_python_type(field):
     """Convert YAML field type to Python type using Python 3.11 syntax for Pydantic 2.4."""
+    # Fields share a handful of shapes, so the mapping is cached per shape
+    return _python_type(field.get("type", "string"), _enum_key(field),
+                        _items_key(field.get("items")), field.get("format"))
+
+@lru_cache(maxsize=None)
+def _python_type(field_type, enum_values, items, field_format):
+    """Python type for a field shape as built by get_python_type()."""
     # Handle enums with Literal types
-    if "enum" in field:
+    if enum_values:
         # If field has enum values, return Literal type
-        enum_values = field["enum"]
-        if enum_values:
-            return f"Literal[{', '.join([repr(val) for val in enum_values])}]"
+        return f"Literal[{', '.join([repr(val) for val in enum_values])}]"
 
-    # For object types, use dict with proper typing (Python 3.11 style)
-    if field.get("type") == "object":
-        if "properties" in field:
-            # This is a complex object with defined properties
-            # Could create nested models for complex objects, but that gets complicated
-            # Using dict[str, Any] for simplicity (Python 3.11 style)
-            return "dict[str, Any]"
-        return "dict[str, Any]"  # Generic dict type
+    # For object types, use dict with proper typing (Python 3.11 style).
+    # Objects with defined properties could get nested models, but that
+    # gets complicated; dict[str, Any] is used for those as well
+    if field_type == "object":
+        return "dict[str, Any]"
 
-    base_type = PYTHON_TYPE_MAP.get(field.get("type", "string"), "Any")
+    base_type = PYTHON_TYPE_MAP.get(field_type, "Any")
 
     # Handle arrays with proper generic types (Python 3.11 style)
     if base_type == "List":
-        if isinstance(field.get("items"), dict) and "type" in field.get("items", {}):
-            item_type = field["items"]["type"]
+        if items is not None and items[0] == "dict" and len(items) == 2:
+            item_type = items[1]
             if item_type == "string":
                 return "list[str]"  # List of strings
             elif item_type == "integer":
@@ -531,19 +552,18 @@ def get_python_type(field):
                 return "list[dict[str, Any]]"  # List of objects
             else:
                 return "list[Any]"  # Generic list
-        elif isinstance(field.get("items"), str):
+        elif items is not None and items[0] == "str":
             # If items is a string, it's a reference to another type
-            item_type = PYTHON_TYPE_MAP.get(field.get("items"), "Any")
+            item_type = PYTHON_TYPE_MAP.get(items[1], "Any")
             return f"list[{item_type}]"
         else:
             return "list[Any]"  # Generic list
 
     # Handle dates
-    if "format" in field:
-        if field["format"] == "date":
-            return "date"
-        elif field["format"] == "date-time":
-            return "datetime"
+    if field_format == "date":
+        return "date"
+    elif field_format == "date-time":
+        return "datetime"
 
     # Map other types to simple Python types
     type_mapping = {
@@ -589,6 +609,13 @@ def get_ts_type(field):
 
     return base_type
 
+def escape_python_string(text):
+    """Escape text for use inside a double-quoted Python string literal."""
+    # Backslashes first, so the ones added for quotes are not doubled. Two
+    # replace() calls beat str.translate here and return the string itself
+    # when there is nothing to escape
+    return text.replace('\\', '\\\\').replace('"', '\\"')
+
 def generate_python_model_for_schema(schema_name, schema_def):
     """Generate a single Python model class from a schema definition."""
     # Skip schemas without python_class_name - they don't want Python models generated
@@ -598,37 +625,56 @@ def generate_python_model_for_schema(schema_name, schema_def):
     # Use python_class_name from schema
     class_name = schema_def["python_class_name"]
 
-    # Generate fields
-    fields_text = ""
+    # Generate fields (collected in a list and joined once)
+    fields_parts = []
     seen_field_names = set()  # Track field names to prevent duplicates
+    model_field_names = []  # Python property names of the model fields, in order
 
     # Track field mappings for the cosmos_to_python mapper
     field_mappings = {}  # Original Cosmos DB name -> Python property name
     has_custom_property_names = False
 
+    # Fields that need validators or serializers, collected in the same pass
+    date_fields = []  # Optional date fields that may be None
+    email_fields = []
+    date_field_names = []  # All date fields, by Python property name
+
     for field in schema_def.get("fields", []):
         # Get original field name from schema
         original_field_name = field["name"]
 
+        # Field attributes used more than once below, looked up once
+        python_property_name = field.get("python_property_name")
+        yaml_type = field.get("type")
+        is_required = field.get("required", False)
+
         # Use python_property_name if present, otherwise fall back to name
-        field_name = field.get("python_property_name", original_field_name)
+        field_name = python_property_name if "python_property_name" in field else original_field_name
 
         # Check if this field has a custom property name
-        if field.get("python_property_name") and field["python_property_name"] != original_field_name:
-            field_mappings[original_field_name] = field["python_property_name"]
+        if python_property_name and python_property_name != original_field_name:
+            field_mappings[original_field_name] = python_property_name
             has_custom_property_names = True
 
         # Store the original field name in the field dictionary for serializer use later
         field["original_name"] = original_field_name
 
+        # Classified before the duplicate check, so duplicates count as well
+        if field.get("format") in ("date", "date-time"):
+            date_field_names.append(field_name)
+            if not is_required:
+                date_fields.append(original_field_name)
+        if original_field_name.lower().endswith("email") and yaml_type == "string":
+            email_fields.append(original_field_name)
+
         # Skip duplicate field names
         if field_name in seen_field_names:
             print(f"Warning: Duplicate field '{field_name}' in {class_name}. Skipping duplicate.")
             continue
 
         seen_field_names.add(field_name)
+        model_field_names.append(field_name)
         field_type = get_python_type(field)
-        is_required = field.get("required", False)
 
         # Check for contradictory field definitions (validation warning)
         if is_required and "default" in field:
@@ -638,66 +684,67 @@ def generate_python_model_for_schema(schema_name, schema_def):
                   f"Treating as field with default (not required).")
 
         # Ensure description strings are properly escaped
-        description = field.get('description', '').replace('"', '\\"')
-        title = field.get('title', field_name).replace('"', '\\"')
+        description = escape_python_string(field.get('description', ''))
+        title = escape_python_string(field.get('title', field_name))
 
         # Build field definition - prioritize defaults over required flag
         has_default = "default" in field
-        is_empty_list_default = field_type.startswith("list") and field.get("default") == []
+        default_val = field.get("default")
+        is_empty_list_default = field_type.startswith("list") and default_val == []
 
+        annotation = field_type
         if has_default and not is_empty_list_default:
             # Field has a concrete default value (not empty list)
-            default_val = field.get("default")
             if isinstance(default_val, str):
-                field_def = f"    {field_name}: {field_type} = Field(default=\"{default_val}\", "
-            elif isinstance(default_val, bool):
-                field_def = f"    {field_name}: {field_type} = Field(default={default_val}, "
+                default_arg = f"default=\"{default_val}\""
             else:
-                field_def = f"    {field_name}: {field_type} = Field(default={default_val}, "
+                default_arg = f"default={default_val}"
         elif is_empty_list_default:
             # Special case: array with empty list default
-            field_def = f"    {field_name}: {field_type} = Field(default=[], "
+            default_arg = "default=[]"
         elif is_required:
             # Field is required with no default value
-            field_def = f"    {field_name}: {field_type} = Field(..., "
+            default_arg = "..."
         else:
             # Field is optional (not required, no default)
             # Use Python 3.11 style: Optional[T] -> T | None
-            field_def = f"    {field_name}: {field_type} | None = Field(None, "
+            annotation = f"{field_type} | None"
+            default_arg = "None"
 
-        field_def += f"description=\"{description}\", "
-        field_def += f"title=\"{title}\""
+        # Field() arguments, joined once
+        field_args = [default_arg, f"description=\"{description}\"", f"title=\"{title}\""]
 
         # Add validation parameters for min/max values
-        if "minimum" in field and field.get("type") in ["integer", "number"]:
-            field_def += f", ge={field.get('minimum')}"
-        if "maximum" in field and field.get("type") in ["integer", "number"]:
-            field_def += f", le={field.get('maximum')}"
+        if yaml_type in ("integer", "number"):
+            if "minimum" in field:
+                field_args.append(f"ge={field['minimum']}")
+            if "maximum" in field:
+                field_args.append(f"le={field['maximum']}")
 
         # Add string validation for min/max length
-        if "minLength" in field and field.get("type") == "string":
-            field_def += f", min_length={field.get('minLength')}"
-        if "maxLength" in field and field.get("type") == "string":
-            field_def += f", max_length={field.get('maxLength')}"
+        if yaml_type == "string":
+            if "minLength" in field:
+                field_args.append(f"min_length={field['minLength']}")
+            if "maxLength" in field:
+                field_args.append(f"max_length={field['maxLength']}")
 
-        # Close the Field parameter list
-        field_def += ")"
+        field_def = f"    {field_name}: {annotation} = Field({', '.join(field_args)})"
 
         # Add enum values as comments for documentation (even though we're now using Literal types)
         if "enum" in field:
             enum_values = ", ".join([f'"{val}"' for val in field["enum"]])
             field_def += f"  # Allowed values: {enum_values}"
-        fields_text += field_def + "\n"
+        fields_parts.append(field_def + "\n")
 
     # Generate model validators
-    validators_text = ""
+    validators_parts = []
 
     # Add Cosmos DB field name mapping if needed
     if has_custom_property_names:
         # Only store the cosmos_to_python map - the inverse will be generated when needed
         cosmos_map_str = ", ".join([f'"{cosmos}": "{python}"' for cosmos, python in field_mappings.items()])
 
-        validators_text += f"""
+        validators_parts.append(f"""
     model_config = ConfigDict(
         populate_by_name=True,
         extra="forbid",
@@ -708,50 +755,47 @@ def generate_python_model_for_schema(schema_name, schema_def):
             "cosmos_to_python_map": {{{cosmos_map_str}}}
         }}
     )
-"""
+""")
+
+        # Specialized model_dump_cosmos with every rename spelled out; the
+        # generic base method maps each key through a dict at runtime
+        python_to_cosmos = {python: cosmos for cosmos, python in field_mappings.items()}
+        dump_items = "".join([
+            f'            "{python_to_cosmos.get(name, name)}": data["{name}"],\n'
+            for name in model_field_names
+        ])
+        validators_parts.append(f"""
+    def model_dump_cosmos(self, **kwargs) -> dict:
+        \"\"\"Dump model as a dictionary using Cosmos DB field names.\"\"\"
+        if kwargs or type(self) is not {class_name}:
+            # Dump options may drop fields and subclasses may add them
+            return super().model_dump_cosmos(**kwargs)
+        data = self.model_dump()
+        return {{
+{dump_items}        }}
+""")
     else:
-        validators_text += """
+        validators_parts.append("""
     model_config = ConfigDict(
         populate_by_name=True, extra="forbid", str_strip_whitespace=True
     )
-"""
-
-    # Check if any fields have format or pattern constraints that need validators
-    date_fields = []
-    email_fields = []
-
-    for field in schema_def.get("fields", []):
-        if field.get("format") == "date" or field.get("format") == "date-time":
-            # Only for optional date fields that may be None
-            if not field.get("required", False):
-                date_fields.append(field["name"])
-        if field["name"].lower().endswith("email") and field.get("type") == "string":
-            email_fields.append(field["name"])
+""")
 
     # Add validators for date fields if needed
     if date_fields:
-        validators_text += f"""
+        validators_parts.append(f"""
     @model_validator(mode='after')
     def validate_date_fields(self) -> '{class_name}':
         \"\"\"Validate date fields that should be None or valid dates.\"\"\"
         # Validation logic here if needed
         return self
-"""
+""")
 
-    # Add field serializers for specific types
-    date_serializer_fields = [f for f in schema_def.get("fields", [])
-                              if f.get("format") == "date" or f.get("format") == "date-time"]
-    if date_serializer_fields:
-        # Get all date field names - use python_property_name for serializer references if available
-        date_field_names = []
-        for f in date_serializer_fields:
-            if "python_property_name" in f:
-                date_field_names.append(f["python_property_name"])
-            else:
-                date_field_names.append(f["name"])
-        if date_field_names:
-            # Add a date serializer that converts dates to ISO format strings
-            validators_text += f"""
+    # Add field serializers for specific types - date fields are referenced
+    # by python_property_name if available
+    if date_field_names:
+        # Add a date serializer that converts dates to ISO format strings
+        validators_parts.append(f"""
     @field_serializer({', '.join([f"'{name}'" for name in date_field_names])})
     def serialize_dates(self, date_value: date | datetime | None) -> str | None:
         \"\"\"Serialize date fields to ISO format strings.\"\"\"
@@ -760,7 +804,10 @@ def generate_python_model_for_schema(schema_name, schema_def):
         if isinstance(date_value, datetime):
             return date_value.isoformat()
         return date_value.isoformat()
-"""
+""")
+
+    fields_text = "".join(fields_parts)
+    validators_text = "".join(validators_parts)
 
     # Generate the model
     model_text = PYTHON_MODEL_CLASS_TEMPLATE.format(
@@ -776,219 +823,278 @@ def generate_python_model_for_schema(schema_name, schema_def):
 
     return class_name, model_text
 
-def generate_python_models_split(schemas, output_dir):
-    """Generate Pydantic models split by API."""
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def group_schemas_by_api(schemas):
+    """
+    Group schemas by api_name (default 'Common').
 
+    Both APIs and the schemas within each API keep the order in which they
+    were loaded (schema files are read in sorted order), so the generated
+    files are stable from run to run.
+
+    Returns:
+        Dict of api_name -> [(schema_name, schema_def), ...]
+    """
+    schemas_by_api = {}
+    for item in schemas.items():
+        schemas_by_api.setdefault(item[1].get('api_name', 'Common'), []).append(item)
+    return schemas_by_api
+
+def _build_api_file(job):
+    """
+    Render the Python models file of one API.
+
+    Module-level (and taking one tuple) so it can run in a worker process.
+
+    Args:
+        job: (api_name, [(schema_name, schema_def), ...], timestamp)
+
+    Returns:
+        (file_base_name, class_names, file_text, import_line)
+    """
+    api_name, api_schemas, timestamp = job
+
+    # Convert API name to filename
+    file_base_name = api_name_to_snake_case(api_name) + "_api_base_models"
+
+    # Generate models for this API
+    models_parts = []
+    api_model_names = []
+
+    for schema_name, schema_def in api_schemas:
+        class_name, model_text = generate_python_model_for_schema(schema_name, schema_def)
+        if class_name is None:  # Schema was skipped (no python_class_name)
+            continue
+        models_parts.append(model_text)
+        api_model_names.append(class_name)
+
+    file_text = PYTHON_API_MODELS_TEMPLATE.format(
+        timestamp=timestamp,
+        api_name=api_name,
+        models="".join(models_parts)
+    )
+    import_line = f"from .{file_base_name} import {', '.join(api_model_names)}"
+    return file_base_name, api_model_names, file_text, import_line
+
+def generate_python_models_split(schemas, output_dir, timestamp, post_write=None):
+    """Generate Pydantic models split by API; returns the paths of the files written.
+
+    timestamp is the generation time written into every file header;
+    post_write is passed on to write_generated_files().
+    """
     # Group schemas by api_name
-    schemas_by_api = defaultdict(list)
-    for schema_name, schema_def in schemas.items():
-        api_name = schema_def.get('api_name', 'Common')
-        schemas_by_api[api_name].append((schema_name, schema_def))
+    schemas_by_api = group_schemas_by_api(schemas)
 
     # Track all model names for exports
     all_model_names = []
     api_file_imports = []
 
-    # Write cosmos_base.py
-    base_path = output_dir / "cosmos_base.py"
-    with open(base_path, "w") as f:
-        f.write(COSMOSDB_BASE_MODEL)
+    # Rendered (path, text) pairs, written together at the end
+    generated = []
 
-    # Generate file for each API
-    for api_name, api_schemas in schemas_by_api.items():
-        # Convert API name to filename
-        file_base_name = api_name_to_snake_case(api_name) + "_api_base_models"
+    # cosmos_base.py
+    generated.append((output_dir / "cosmos_base.py", COSMOSDB_BASE_MODEL))
 
-        # Generate models for this API
-        models_text = ""
-        api_model_names = []
+    # Generate file for each API; the APIs are independent, so large schema
+    # sets are rendered in worker processes (results keep the API order)
+    jobs = [(api_name, api_schemas, timestamp) for api_name, api_schemas in schemas_by_api.items()]
+    for file_base_name, api_model_names, file_text, import_line in map_api_jobs(_build_api_file, jobs, len(schemas)):
+        all_model_names.extend(api_model_names)
 
-        for schema_name, schema_def in api_schemas:
-            class_name, model_text = generate_python_model_for_schema(schema_name, schema_def)
-            if class_name is None:  # Schema was skipped (no python_class_name)
-                continue
-            models_text += model_text
-            api_model_names.append(class_name)
-            all_model_names.append(class_name)
-
-        # Write API-specific file
-        api_file_path = output_dir / f"{file_base_name}.py"
-        with open(api_file_path, "w") as f:
-            f.write(PYTHON_API_MODELS_TEMPLATE.format(
-                timestamp=timestamp,
-                api_name=api_name,
-                models=models_text
-            ))
+        # API-specific file
+        generated.append((output_dir / f"{file_base_name}.py", file_text))
 
         # Add import for this API file
-        api_file_imports.append(f"from .{file_base_name} import {', '.join(api_model_names)}")
-
-    # Write __init__.py with all imports
-    init_path = output_dir / "__init__.py"
-    with open(init_path, "w") as f:
-        imports_text = "\n".join(api_file_imports)
-        all_exports = "\n".join([f"    '{name}'," for name in all_model_names])
-        f.write(PYTHON_INIT_AGGREGATED_TEMPLATE.format(
-            timestamp=timestamp,
-            imports=imports_text,
-            all_exports=all_exports
-        ))
-
-    # Write backward compatibility database.py
-    database_path = output_dir / "database.py"
-    with open(database_path, "w") as f:
-        imports_text = "\n".join(api_file_imports)
-        all_exports = "\n".join([f"    '{name}'," for name in all_model_names])
-        f.write(PYTHON_BACKWARD_COMPAT_TEMPLATE.format(
-            timestamp=timestamp,
-            imports=imports_text,
-            all_exports=all_exports
-        ))
-
-def generate_typescript_interfaces_split(schemas, output_dir):
-    """Generate TypeScript interfaces split by API."""
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        api_file_imports.append(import_line)
 
-    # Group schemas by api_name
-    schemas_by_api = defaultdict(list)
-    for schema_name, schema_def in schemas.items():
-        api_name = schema_def.get('api_name', 'Common')
-        schemas_by_api[api_name].append((schema_name, schema_def))
+    imports_text = "\n".join(api_file_imports)
+    all_exports = "\n".join([f"    '{name}'," for name in all_model_names])
 
-    # Track all exports
-    all_exports = []
+    # __init__.py with all imports
+    generated.append((output_dir / "__init__.py", PYTHON_INIT_AGGREGATED_TEMPLATE.format(
+        timestamp=timestamp,
+        imports=imports_text,
+        all_exports=all_exports
+    )))
 
-    # Write cosmos-base.ts
-    base_path = output_dir / "cosmos-base.ts"
-    with open(base_path, "w") as f:
-        f.write(TS_BASE_TEMPLATE.format(timestamp=timestamp))
-
-    # Process each API
-    for api_name, api_schemas in schemas_by_api.items():
-        # Convert API name to filename
-        file_base_name = api_name_to_kebab_case(api_name) + "-api-base-models"
-
-        # Generate enums, interfaces, and mappings for this API
-        all_enums = ""
-        all_interfaces = ""
-        all_mappings = ""
-        processed_enum_names = set()
-
-        for schema_name, schema_def in api_schemas:
-            # Skip schemas without typescript_class_name - they don't want TypeScript interfaces generated
-            if "typescript_class_name" not in schema_def:
-                continue
+    # Backward compatibility database.py
+    generated.append((output_dir / "database.py", PYTHON_BACKWARD_COMPAT_TEMPLATE.format(
+        timestamp=timestamp,
+        imports=imports_text,
+        all_exports=all_exports
+    )))
+
+    return write_generated_files(generated, output_dir, timestamp, post_write)
+
+def _build_ts_api_file(job):
+    """
+    Render the TypeScript models file of one API.
 
-            # Use typescript_class_name from schema
-            interface_name = schema_def["typescript_class_name"]
+    Module-level (and taking one tuple) so it can run in a worker process.
 
-            # Generate enums for fields with enum values
-            for field in schema_def.get("fields", []):
-                if "enum" in field:
-                    field_prop_name = field.get("typescript_property_name", field["name"])
-                    enum_name = interface_name + to_pascal_case(field_prop_name) + "Enum"
+    Args:
+        job: (api_name, [(schema_name, schema_def), ...], timestamp)
 
-                    if enum_name not in processed_enum_names:
-                        processed_enum_names.add(enum_name)
+    Returns:
+        (file_base_name, file_text)
+    """
+    api_name, api_schemas, timestamp = job
+
+    # Convert API name to filename
+    file_base_name = api_name_to_kebab_case(api_name) + "-api-base-models"
+
+    # Generate enums, interfaces, and mappings for this API (collected
+    # in lists and joined once)
+    enums_parts = []
+    interfaces_parts = []
+    mappings_parts = []
+    processed_enum_names = set()
+    # Emitted enum name per set of enum values
+    enum_names_by_values = {}
+
+    for schema_name, schema_def in api_schemas:
+        # Skip schemas without typescript_class_name - they don't want TypeScript interfaces generated
+        if "typescript_class_name" not in schema_def:
+            continue
 
-                        enum_values_text = ""
-                        for enum_val in field["enum"]:
-                            enum_key = re.sub(r'[^a-zA-Z0-9]', '_', enum_val).upper()
-                            enum_values_text += f"  {enum_key} = '{enum_val}',\n"
+        # Use typescript_class_name from schema
+        interface_name = schema_def["typescript_class_name"]
+
+        # (db name, TypeScript name) pairs of this interface's renamed fields,
+        # in field order; both mapping directions are written from them
+        mapping_pairs = []
+        mapped_db_names = set()
+        has_custom_property_names = False
+
+        # Generate enums and fields in one pass over the schema's fields
+        fields_parts = []
+        for field in schema_def.get("fields", []):
+            original_field_name = field["name"]
+            field_name = field.get("typescript_property_name", original_field_name)
+            enum_values = field.get("enum")
+
+            # Generate an enum for fields with enum values
+            if enum_values is not None:
+                enum_name = interface_name + to_pascal_case(field_name) + "Enum"
+
+                if enum_name not in processed_enum_names:
+                    processed_enum_names.add(enum_name)
+                    values_key = frozenset(enum_values)
+                    shared_enum_name = enum_names_by_values.get(values_key)
+
+                    if shared_enum_name is not None:
+                        # Same values as an enum already emitted for this API
+                        # (e.g. a field reused via include_field_sets): export
+                        # that enum under this name too instead of a copy
+                        enums_parts.append(f"export {{ {shared_enum_name} as {enum_name} }};\n\n")
+                    else:
+                        enum_names_by_values[values_key] = enum_name
+
+                        enum_values_text = "".join([
+                            f"  {NON_ALNUM_RE.sub('_', enum_val).upper()} = '{enum_val}',\n"
+                            for enum_val in enum_values
+                        ])
 
                         enum_text = TS_ENUM_TEMPLATE.format(
                             enum_name=enum_name,
                             enum_values=enum_values_text
                         )
-                        all_enums += enum_text + "\n"
-
-            # Track field mappings for this interface
-            cosmos_to_ts_mappings = {}
-            ts_to_cosmos_mappings = {}
-            has_custom_property_names = False
-
-            # Generate fields
-            fields_text = ""
-            for field in schema_def.get("fields", []):
-                original_field_name = field["name"]
-                field_name = field.get("typescript_property_name", original_field_name)
-
-                # Check for custom property names
-                if field.get("typescript_property_name") and field["typescript_property_name"] != original_field_name:
-                    cosmos_to_ts_mappings[original_field_name] = field["typescript_property_name"]
-                    ts_to_cosmos_mappings[field["typescript_property_name"]] = original_field_name
-                    has_custom_property_names = True
-                elif field.get("python_property_name"):
-                    has_custom_property_names = True
-                    if original_field_name not in cosmos_to_ts_mappings:
-                        cosmos_to_ts_mappings[original_field_name] = original_field_name
-                        ts_to_cosmos_mappings[original_field_name] = original_field_name
-
-                field_type = get_ts_type(field)
-
-                # Add comments
-                fields_text += f"  /** {field.get('title', field_name)} - {field.get('description', '')} */\n"
-
-                # Mark as optional if not required
-                is_required = field.get("required", False)
-                if is_required:
-                    fields_text += f"  {field_name}: {field_type};\n"
-                else:
-                    fields_text += f"  {field_name}?: {field_type};\n"
-
-            # Add interface
-            interface_text = TS_INTERFACE_TEMPLATE.format(
+                        enums_parts.append(enum_text + "\n")
+
+            # Check for custom property names. Only TypeScript renames go into
+            # the mapping (unmapped names pass through createCosmosMapping
+            # unchanged); a Python-only rename still gets the mapping export,
+            # so the set of exported mappings does not change
+            if field_name != original_field_name and field_name:
+                if original_field_name not in mapped_db_names:
+                    mapped_db_names.add(original_field_name)
+                    mapping_pairs.append((original_field_name, field_name))
+                has_custom_property_names = True
+            elif field.get("python_property_name"):
+                has_custom_property_names = True
+
+            field_type = get_ts_type(field)
+
+            # Add comments
+            fields_parts.append(f"  /** {field.get('title', field_name)} - {field.get('description', '')} */\n")
+
+            # Mark as optional if not required
+            if field.get("required", False):
+                fields_parts.append(f"  {field_name}: {field_type};\n")
+            else:
+                fields_parts.append(f"  {field_name}?: {field_type};\n")
+
+        # Add interface
+        interface_text = TS_INTERFACE_TEMPLATE.format(
+            interface_name=interface_name,
+            title=schema_def.get('title', interface_name),
+            description=schema_def.get('description', ''),
+            fields="".join(fields_parts)
+        )
+        interfaces_parts.append(interface_text + "\n")
+
+        # Create mappings if needed
+        if has_custom_property_names:
+            mapping_var_name = f"{to_camel_case(schema_name)}Mapping"
+
+            cosmos_to_ts_map = "".join([
+                f"    '{db_name}': '{ts_name}',\n" for db_name, ts_name in mapping_pairs
+            ])
+            ts_to_cosmos_map = "".join([
+                f"    '{ts_name}': '{db_name}',\n" for db_name, ts_name in mapping_pairs
+            ])
+
+            mapping_text = TS_MAPPING_TEMPLATE.format(
                 interface_name=interface_name,
-                title=schema_def.get('title', interface_name),
-                description=schema_def.get('description', ''),
-                fields=fields_text
+                mapping_var_name=mapping_var_name,
+                cosmos_to_ts_map=cosmos_to_ts_map,
+                ts_to_cosmos_map=ts_to_cosmos_map
             )
-            all_interfaces += interface_text + "\n"
-
-            # Create mappings if needed
-            if has_custom_property_names:
-                mapping_var_name = f"{to_camel_case(schema_name)}Mapping"
-
-                cosmos_to_ts_map = ""
-                ts_to_cosmos_map = ""
-
-                for db_name, ts_name in cosmos_to_ts_mappings.items():
-                    cosmos_to_ts_map += f"    '{db_name}': '{ts_name}',\n"
-
-                for ts_name, db_name in ts_to_cosmos_mappings.items():
-                    ts_to_cosmos_map += f"    '{ts_name}': '{db_name}',\n"
-
-                mapping_text = TS_MAPPING_TEMPLATE.format(
-                    interface_name=interface_name,
-                    mapping_var_name=mapping_var_name,
-                    cosmos_to_ts_map=cosmos_to_ts_map,
-                    ts_to_cosmos_map=ts_to_cosmos_map
-                )
-                all_mappings += mapping_text + "\n"
-
-        # Write API-specific file
-        api_file_path = output_dir / f"{file_base_name}.ts"
-        with open(api_file_path, "w") as f:
-            f.write(TS_API_MODELS_TEMPLATE.format(
-                timestamp=timestamp,
-                api_name=api_name,
-                enums=all_enums,
-                interfaces=all_interfaces,
-                mappings=all_mappings
-            ))
+            mappings_parts.append(mapping_text + "\n")
+
+    file_text = TS_API_MODELS_TEMPLATE.format(
+        timestamp=timestamp,
+        api_name=api_name,
+        enums="".join(enums_parts),
+        interfaces="".join(interfaces_parts),
+        mappings="".join(mappings_parts)
+    )
+    return file_base_name, file_text
+
+def generate_typescript_interfaces_split(schemas, output_dir, timestamp, post_write=None):
+    """Generate TypeScript interfaces split by API; returns the paths of the files written.
+
+    timestamp is the generation time written into every file header;
+    post_write is passed on to write_generated_files().
+    """
+    # Group schemas by api_name
+    schemas_by_api = group_schemas_by_api(schemas)
+
+    # Track all exports
+    all_exports = []
+
+    # Rendered (path, text) pairs, written together at the end
+    generated = []
+
+    # cosmos-base.ts
+    generated.append((output_dir / "cosmos-base.ts", TS_BASE_TEMPLATE.format(timestamp=timestamp)))
+
+    # Process each API (in worker processes for large schema sets)
+    jobs = [(api_name, api_schemas, timestamp) for api_name, api_schemas in schemas_by_api.items()]
+    for file_base_name, file_text in map_api_jobs(_build_ts_api_file, jobs, len(schemas)):
+        # API-specific file
+        generated.append((output_dir / f"{file_base_name}.ts", file_text))
 
         # Add to exports list
         all_exports.append(f"export * from './{file_base_name}';")
 
-    # Write index.ts
-    index_path = output_dir / "index.ts"
-    with open(index_path, "w") as f:
-        exports_text = "\n".join(all_exports)
-        f.write(TS_INDEX_AGGREGATED_TEMPLATE.format(
-            timestamp=timestamp,
-            exports=exports_text
-        ))
+    # index.ts
+    exports_text = "\n".join(all_exports)
+    generated.append((output_dir / "index.ts", TS_INDEX_AGGREGATED_TEMPLATE.format(
+        timestamp=timestamp,
+        exports=exports_text
+    )))
+
+    return write_generated_files(generated, output_dir, timestamp, post_write)
 
 def parse_args():
     """Parse command-line arguments for validation options."""
@@ -1056,8 +1162,7 @@ def load_all_schema_files(schema_dir):
 
         print(f"  - {yaml_file.name}")
         try:
-            with open(yaml_file, "r") as f:
-                data = yaml.safe_load(f)
+            data = load_yaml_file(yaml_file)
 
             # Get schemas from this file
             file_schemas = data.get("database_schemas", {})
@@ -1085,21 +1190,26 @@ def load_all_schema_files(schema_dir):
     return all_schemas
 
 def load_field_sets(schema_dir):
-    """Load reusable field sets from reused_field_sets.yaml if it exists."""
+    """Load reusable field sets from reused_field_sets.yaml if it exists.
+
+    Returns:
+        Dict mapping each field set name to its list of fields
+    """
     field_sets_path = schema_dir / "reused_field_sets.yaml"
 
     if not field_sets_path.exists():
         return {}
 
     try:
-        with open(field_sets_path, "r") as f:
-            data = yaml.safe_load(f)
-            field_sets = data.get("field_sets", {})
-            print(f"Loaded {len(field_sets)} field sets from reused_field_sets.yaml")
-            for set_name in field_sets:
-                field_count = len(field_sets[set_name].get("fields", []))
-                print(f"  - {set_name}: {field_count} fields")
-            return field_sets
+        data = load_yaml_file(field_sets_path)
+        field_sets = {}
+        for set_name, field_set in data.get("field_sets", {}).items():
+            # Only the fields are needed when merging, so keep just those
+            field_sets[set_name] = field_set.get("fields", [])
+        print(f"Loaded {len(field_sets)} field sets from reused_field_sets.yaml")
+        for set_name, fields in field_sets.items():
+            print(f"  - {set_name}: {len(fields)} fields")
+        return field_sets
     except Exception as e:
         print(f"Warning: Failed to load field sets: {e}")
         return {}
@@ -1111,6 +1221,10 @@ def merge_field_sets_into_schema(schema_def, field_sets):
     If a schema has include_field_sets property, merge the referenced
     field sets' fields with the schema's own fields. Schema-specific fields
     take precedence in case of conflicts.
+
+    Args:
+        schema_def: Schema definition dictionary
+        field_sets: Field lists by field set name, from load_field_sets()
     """
     include_fields = schema_def.get("include_field_sets", [])
 
@@ -1119,27 +1233,28 @@ def merge_field_sets_into_schema(schema_def, field_sets):
 
     # Create a copy to avoid modifying the original
     merged_schema = schema_def.copy()
+    schema_fields = merged_schema.get("fields", [])
 
     # Track field names already in the schema to avoid duplicates
-    existing_field_names = {field["name"] for field in merged_schema.get("fields", [])}
+    existing_field_names = {field["name"] for field in schema_fields}
 
-    # Process each included field set
+    # Collect the included fields in one pass, skipping names already taken
     merged_fields = []
     for field_set_name in include_fields:
-        if field_set_name not in field_sets:
+        set_fields = field_sets.get(field_set_name)
+        if set_fields is None:
             print(f"    Warning: Field set '{field_set_name}' not found in reused_field_sets.yaml")
             continue
 
-        field_set = field_sets[field_set_name]
-        for field in field_set.get("fields", []):
-            # Only add fields that don't already exist in the schema
-            if field["name"] not in existing_field_names:
+        for field in set_fields:
+            field_name = field["name"]
+            if field_name not in existing_field_names:
                 merged_fields.append(field)
-                existing_field_names.add(field["name"])
+                existing_field_names.add(field_name)
 
     # Prepend merged fields to schema's existing fields
     # (schema-specific fields come after to allow overrides)
-    merged_schema["fields"] = merged_fields + merged_schema.get("fields", [])
+    merged_schema["fields"] = merged_fields + schema_fields
 
     return merged_schema
 
@@ -1162,8 +1277,7 @@ def main():
         legacy_yaml_path = base_dir / "definitions" / "common" / "database_tables.yaml"
         if legacy_yaml_path.exists():
             print(f"Loading from legacy location: {legacy_yaml_path}")
-            with open(legacy_yaml_path, "r") as f:
-                data = yaml.safe_load(f)
+            data = load_yaml_file(legacy_yaml_path)
             schemas = data.get("database_schemas", {})
         else:
             print("Error: No schema files found in either new or legacy locations")
@@ -1181,21 +1295,17 @@ def main():
             merged_schema = merge_field_sets_into_schema(schema_def, field_sets)
             schemas[schema_name] = merged_schema
 
-    # Generate split Python models
-    generate_python_models_split(schemas, py_dir)
-    print(f"Generated split Python models in {py_dir}")
+    # One timestamp for the whole run, so Python and TypeScript files match
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Format Python models with Black
-    try:
-        # Format all Python files
-        for py_file in py_dir.glob("*.py"):
-            subprocess.run(["black", str(py_file)], check=True, capture_output=True)
-        print(f"Formatted all Python files with Black")
-    except (ImportError, subprocess.SubprocessError) as e:
-        print(f"Warning: Failed to format: {str(e)}")
+    # Generate split Python models; the files that were (re)written are
+    # formatted with Black, unchanged ones are still formatted from an
+    # earlier run
+    generate_python_models_split(schemas, py_dir, timestamp, format_with_black)
+    print(f"Generated split Python models in {py_dir}")
 
     # Generate split TypeScript interfaces
-    generate_typescript_interfaces_split(schemas, ts_dir)
+    generate_typescript_interfaces_split(schemas, ts_dir, timestamp)
     print(f"Generated split TypeScript interfaces in {ts_dir}")
 
     print("\n" + "="*60)
@@ -3,7 +3,7 @@
 # dependencies = [
 #   "pymysql",
 #   "python-dotenv",
-#   "pyyaml",
+#   "pyyaml",  # binary wheels bundle libyaml (CSafeLoader)
 # ]
 # ///
 """
@@ -11,36 +11,9 @@ Execute MariaDB 5.5 compatible schema migration.
 This script adapts the generated schema for MariaDB 5.5 compatibility.
 """
 
-import os
 import sys
-from pathlib import Path
-from dotenv import load_dotenv
-import pymysql
-import yaml
-
-
-def load_environment():
-    """Load environment variables from .env file."""
-    env_path = Path(__file__).parent.parent / '.env'
-    if env_path.exists():
-        load_dotenv(env_path)
-
-
-def get_connection_config():
-    """Get vosscloud connection configuration."""
-    config_path = Path(__file__).parent.parent / 'config' / 'database.yaml'
-    with open(config_path, 'r') as f:
-        db_config = yaml.safe_load(f)
-    conn_settings = db_config['mysql_connections']['vosscloud']
-    env_prefix = conn_settings['env_prefix']
-    return {
-        'host': os.getenv(f'{env_prefix}_HOST'),
-        'port': int(os.getenv(f'{env_prefix}_PORT', '3306')),
-        'user': os.getenv(f'{env_prefix}_USER'),
-        'password': os.getenv(f'{env_prefix}_PASSWORD'),
-        'database': 'indomonitor',
-        'charset': 'utf8mb4',
-    }
+
+from _db import get_conn, get_connection_config
 
 
 # MariaDB 5.5 compatible schema statements
@@ -144,72 +117,66 @@ FK_STATEMENTS = [
 
 def execute_migration():
     """Execute the schema migration."""
-    load_environment()
     config = get_connection_config()
 
     print(f"Connecting to {config['host']}:{config['port']} as {config['user']}...")
-    connection = pymysql.connect(
-        host=config['host'],
-        port=config['port'],
-        user=config['user'],
-        password=config['password'],
-        database=config['database'],
-        charset=config['charset'],
-    )
-
-    try:
-        with connection.cursor() as cursor:
-            print("\n" + "="*80)
-            print("Creating Tables")
-            print("="*80)
-
-            table_names = ['scraper_scripts', 'site_structure_reports', 'agent_runs',
-                          'scrape_runs', 'news_scrapes']
-
-            for i, (name, stmt) in enumerate(zip(table_names, SCHEMA_STATEMENTS), 1):
-                print(f"\n[{i}/5] Creating table: {name}")
-                try:
-                    cursor.execute(stmt)
-                    connection.commit()
-                    print(f"    ✓ Success")
-                except Exception as e:
-                    print(f"    ✗ Error: {e}")
-                    raise
-
-            print("\n" + "="*80)
-            print("Adding Foreign Key Constraints")
-            print("="*80)
-
-            for i, stmt in enumerate(FK_STATEMENTS, 1):
-                # Extract constraint name from statement
-                constraint_name = stmt.split('CONSTRAINT')[1].split('FOREIGN')[0].strip()
-                print(f"\n[{i}/{len(FK_STATEMENTS)}] Adding constraint: {constraint_name}")
-                try:
-                    cursor.execute(stmt)
-                    connection.commit()
-                    print(f"    ✓ Success")
-                except Exception as e:
-                    print(f"    ✗ Error: {e}")
-                    # Continue with other constraints even if one fails
-
-            print("\n" + "="*80)
-            print("Verifying Migration")
-            print("="*80)
-
-            cursor.execute("SHOW TABLES FROM indomonitor")
-            tables = [row[0] for row in cursor.fetchall()]
-            print(f"\nTables created: {len(tables)}")
-            for table in sorted(tables):
-                cursor.execute(f"SELECT COUNT(*) FROM indomonitor.{table}")
-                count = cursor.fetchone()[0]
-                print(f"  - {table}: {count} rows")
-
-            print("\n" + "="*80)
-            print("Migration Completed Successfully!")
-            print("="*80)
-
-    finally:
-        connection.close()
+    connection = get_conn()
+
+    # Only DDL runs here, which MySQL commits implicitly statement by
+    # statement, so no commit() round-trips are needed
+    with connection.cursor() as cursor:
+        print("\n" + "="*80)
+        print("Creating Tables")
+        print("="*80)
+
+        table_names = ['scraper_scripts', 'site_structure_reports', 'agent_runs',
+                      'scrape_runs', 'news_scrapes']
+
+        for i, (name, stmt) in enumerate(zip(table_names, SCHEMA_STATEMENTS), 1):
+            print(f"\n[{i}/5] Creating table: {name}")
+            try:
+                cursor.execute(stmt)
+                print(f"    ✓ Success")
+            except Exception as e:
+                print(f"    ✗ Error: {e}")
+                raise
+
+        print("\n" + "="*80)
+        print("Adding Foreign Key Constraints")
+        print("="*80)
+
+        for i, stmt in enumerate(FK_STATEMENTS, 1):
+            # Extract constraint name from statement
+            constraint_name = stmt.split('CONSTRAINT')[1].split('FOREIGN')[0].strip()
+            print(f"\n[{i}/{len(FK_STATEMENTS)}] Adding constraint: {constraint_name}")
+            try:
+                cursor.execute(stmt)
+                print(f"    ✓ Success")
+            except Exception as e:
+                print(f"    ✗ Error: {e}")
+                # Continue with other constraints even if one fails
+
+        print("\n" + "="*80)
+        print("Verifying Migration")
+        print("="*80)
+
+        cursor.execute("SHOW TABLES FROM indomonitor")
+        tables = sorted(row[0] for row in cursor.fetchall())
+        print(f"\nTables created: {len(tables)}")
+
+        # Exact counts of all tables in one round trip, one scalar subquery each
+        counts = ()
+        if tables:
+            cursor.execute("SELECT " + ", ".join(
+                f"(SELECT COUNT(*) FROM indomonitor.`{table}`)" for table in tables
+            ))
+            counts = cursor.fetchone()
+        for table, count in zip(tables, counts):
+            print(f"  - {table}: {count} rows")
+
+        print("\n" + "="*80)
+        print("Migration Completed Successfully!")
+        print("="*80)
 
 
 if __name__ == '__main__':
@@ -4,35 +4,46 @@
 #   "httpx",
 # ]
 # ///
-"""Test Splash HTTP API using httpx"""
+"""Test Splash HTTP API using httpx
 
+The three endpoint tests are independent, so they run concurrently on one
+AsyncClient; each prints its report in one block once its response is in,
+followed by a PASS/FAIL line per test. Exits with 1 if any test failed.
+"""
+
+import asyncio
 import httpx
 import json
+import sys
 
 # Splash server URL
 SPLASH_URL = "http://vosscloud:32768"
 
-def test_render_html():
+# Client timeout in seconds, above the 10 s render timeout given to Splash
+CLIENT_TIMEOUT = 15
+
+async def test_render_html(client):
     """Test render.html endpoint"""
-    print("Testing render.html endpoint...")
-    response = httpx.get(
-        f"{SPLASH_URL}/render.html",
+    response = await client.get(
+        "/render.html",
         params={
             "url": "http://example.com",
             "wait": 1,
             "timeout": 10
         }
     )
-    print(f"Status: {response.status_code}")
-    print(f"HTML length: {len(response.text)} characters")
-    print(f"First 200 chars: {response.text[:200]}")
-    print()
+    print("\n".join([
+        "Testing render.html endpoint...",
+        f"Status: {response.status_code}",
+        f"HTML length: {len(response.text)} characters",
+        f"First 200 chars: {response.text[:200]}",
+        "",
+    ]))
 
-def test_render_json():
+async def test_render_json(client):
     """Test render.json endpoint"""
-    print("Testing render.json endpoint...")
-    response = httpx.get(
-        f"{SPLASH_URL}/render.json",
+    response = await client.get(
+        "/render.json",
         params={
             "url": "http://example.com",
             "html": 1,
@@ -41,16 +52,18 @@ def test_render_json():
             "timeout": 10
         }
     )
-    print(f"Status: {response.status_code}")
     data = response.json()
-    print(f"URL: {data['url']}")
-    print(f"Title: {data['title']}")
-    print(f"HTML length: {len(data['html'])} characters")
-    print()
+    print("\n".join([
+        "Testing render.json endpoint...",
+        f"Status: {response.status_code}",
+        f"URL: {data['url']}",
+        f"Title: {data['title']}",
+        f"HTML length: {len(data['html'])} characters",
+        "",
+    ]))
 
-def test_execute_lua():
+async def test_execute_lua(client):
     """Test execute endpoint with Lua script"""
-    print("Testing execute endpoint with Lua script...")
     lua_script = """function main(splash, args)
     assert(splash:go(args.url))
     assert(splash:wait(1.0))
@@ -62,22 +75,49 @@ def test_execute_lua():
     }
 end"""
 
-    response = httpx.post(
-        f"{SPLASH_URL}/execute",
+    response = await client.post(
+        "/execute",
         json={
             "lua_source": lua_script,
             "url": "http://example.com",
             "timeout": 10
         }
     )
-    print(f"Status: {response.status_code}")
     data = response.json()
-    print(f"URL: {data['url']}")
-    print(f"Title: {data['title']}")
-    print(f"HTML length: {len(data['html'])} characters")
-    print()
+    print("\n".join([
+        "Testing execute endpoint with Lua script...",
+        f"Status: {response.status_code}",
+        f"URL: {data['url']}",
+        f"Title: {data['title']}",
+        f"HTML length: {len(data['html'])} characters",
+        "",
+    ]))
+
+TESTS = [test_render_html, test_render_json, test_execute_lua]
+
+async def run_tests():
+    """Run all endpoint tests concurrently on one client.
+
+    A failing test does not stop the others; every test's result is
+    reported once all of them are done.
+
+    Returns:
+        Number of failed tests
+    """
+    async with httpx.AsyncClient(base_url=SPLASH_URL, timeout=CLIENT_TIMEOUT) as client:
+        results = await asyncio.gather(
+            *(test(client) for test in TESTS),
+            return_exceptions=True
+        )
+
+    failed = 0
+    for test, result in zip(TESTS, results):
+        if isinstance(result, BaseException):
+            print(f"FAIL {test.__name__}: {result!r}", file=sys.stderr)
+            failed += 1
+        else:
+            print(f"PASS {test.__name__}")
+    return failed
 
 if __name__ == "__main__":
-    test_render_html()
-    test_render_json()
-    test_execute_lua()
+    sys.exit(1 if asyncio.run(run_tests()) else 0)